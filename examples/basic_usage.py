@@ -8,25 +8,33 @@ Prerequisites:
 """
 
 import asyncio
+import logging
 import os
 from openlogo import LogoCrawler
 
+# uvloop (installed with the "speedups" extra) is a faster drop-in event loop
+try:
+    import uvloop
+except ImportError:
+    uvloop = None
+
 
 async def main():
+    # openlogo logs progress through the standard logging module
+    logging.basicConfig(level=logging.INFO, format="%(levelname)s %(name)s: %(message)s")
+
     # Get API key from environment
     api_key = os.environ.get("OPENAI_API_KEY")
     if not api_key:
         print("Error: Set OPENAI_API_KEY environment variable")
         return
 
-    # Create crawler
-    crawler = LogoCrawler(api_key=api_key)
-
-    # Crawl a website
+    # Crawl a website; leaving the block closes the crawler's HTTP session
     url = "https://stripe.com"
     print(f"Crawling {url} for logos...")
     
-    results = await crawler.crawl_website(url)
+    async with LogoCrawler(api_key=api_key) as crawler:
+        results = await crawler.crawl_website(url)
 
     # Print results
     print(f"\nFound {len(results)} logo(s):\n")
@@ -38,6 +46,9 @@ async def main():
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    if uvloop is not None:
+        uvloop.run(main())
+    else:
+        asyncio.run(main())
 
 
@@ -1,9 +1,13 @@
 import asyncio
+import concurrent.futures
+import multiprocessing
 import os
 import csv
-from typing import List, Dict, Optional, Set, Tuple
+from collections import OrderedDict
+from contextlib import asynccontextmanager
+from typing import Iterator, List, Dict, Optional, Set, Tuple
 from urllib.parse import urljoin, urlparse
-import hashlib
+import logging
 from datetime import datetime, timedelta
 import urllib.request
 import json
@@ -11,13 +15,20 @@ import ssl
 import base64
 import cairosvg
 import io
+import itertools
 from pathlib import Path
 
 import aiohttp
-from bs4 import BeautifulSoup, Tag
+from bs4 import BeautifulSoup, SoupStrainer
+import soupsieve
 from PIL import Image
 from pydantic import BaseModel
+import random
 import re
+import struct
+import sys
+import threading
+import time
 from rich.progress import Progress, SpinnerColumn, TextColumn, BarColumn, TaskProgressColumn
 
 # Optional: rembg for background removal
@@ -36,37 +47,89 @@ except ImportError:
     SUPABASE_AVAILABLE = False
     Client = None  # type: ignore
 
-from .detection import LogoDetectionStrategies, LogoCandidate
+from .detection import (
+    LogoDetectionStrategies, HTML_PARSER, ORJSON_AVAILABLE, is_svg, orjson, _content_hash, _json_loads,
+)
 
+logger = logging.getLogger(__name__)
 
-async def try_clearbit_logo(domain: str, website_url: str) -> Optional["LogoResult"]:
+
+def _json_default(obj):
+    """Serialize datetimes for the stdlib json fallback the way orjson does natively."""
+    if isinstance(obj, datetime):
+        return obj.isoformat()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def _json_dumps(obj, indent: bool = False) -> bytes:
+    """Serialize obj to UTF-8 JSON bytes, using orjson when it is installed.
+    
+    Output is compact unless indent is True, which uses a two-space indent.
+    datetime values are written as ISO 8601 strings.
+    """
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 if indent else None)
+    if indent:
+        return json.dumps(obj, indent=2, default=_json_default).encode('utf-8')
+    return json.dumps(obj, separators=(',', ':'), default=_json_default).encode('utf-8')
+
+
+def _render_svg(svg_data: bytes) -> bytes:
+    """Render SVG bytes to PNG bytes (module-level so a process pool can run it)."""
+    return cairosvg.svg2png(bytestring=svg_data)
+
+
+def _remove_background(image_data: bytes) -> bytes:
+    """Remove the background from encoded image bytes with rembg, returning PNG bytes.
+    
+    Module-level so a process pool can run it.
+    """
+    return remove(image_data)
+
+
+@asynccontextmanager
+async def _session_or_temporary(session: Optional[aiohttp.ClientSession]):
+    """Yield session, or a temporary ClientSession closed on exit if session is None."""
+    if session is not None:
+        yield session
+    else:
+        async with aiohttp.ClientSession() as temporary_session:
+            yield temporary_session
+
+
+async def try_clearbit_logo(domain: str, website_url: str, session: Optional[aiohttp.ClientSession] = None) -> Optional["LogoResult"]:
     """Try to get logo from Clearbit API (free, fast, high quality).
     
     Clearbit provides curated company logos for most established companies.
     Returns None if Clearbit doesn't have the logo (404) or on any error.
+    
+    Args:
+        domain: The domain to look up (e.g., "example.com")
+        website_url: The full website URL for metadata
+        session: Session to reuse; a temporary one is opened if omitted
     """
     clearbit_url = f"https://logo.clearbit.com/{domain}"
     try:
-        async with aiohttp.ClientSession() as session:
+        async with _session_or_temporary(session) as session:
             async with session.head(clearbit_url, timeout=aiohttp.ClientTimeout(total=5)) as resp:
                 if resp.status == 200:
-                    print(f"✅ Clearbit logo found for {domain}: {clearbit_url}")
+                    logger.info("Clearbit logo found for %s: %s", domain, clearbit_url)
                     return LogoResult(
                         url=clearbit_url,
                         confidence=0.95,
                         description="Logo from Clearbit API",
                         page_url=website_url,
-                        image_hash=hashlib.md5(clearbit_url.encode()).hexdigest(),
+                        image_hash=_content_hash(clearbit_url.encode()),
                         timestamp=datetime.now(),
                         is_header=True,
                         rank_score=2.0,
                     )
     except Exception as e:
-        print(f"ℹ️  Clearbit unavailable for {domain}: {e}")
+        logger.debug("Clearbit unavailable for %s: %s", domain, e)
     return None
 
 
-async def try_google_favicon(domain: str, website_url: str, size: int = 128) -> Optional["LogoResult"]:
+async def try_google_favicon(domain: str, website_url: str, size: int = 128, session: Optional[aiohttp.ClientSession] = None) -> Optional["LogoResult"]:
     """Try to get logo from Google's favicon service (fallback for Clearbit).
     
     Google's favicon service provides favicons for most websites.
@@ -77,10 +140,11 @@ async def try_google_favicon(domain: str, website_url: str, size: int = 128) ->
         domain: The domain to get favicon for (e.g., "example.com")
         website_url: The full website URL for metadata
         size: Icon size (16, 32, 64, 128, 256)
+        session: Session to reuse; a temporary one is opened if omitted
     """
     favicon_url = f"https://www.google.com/s2/favicons?domain={domain}&sz={size}"
     try:
-        async with aiohttp.ClientSession() as session:
+        async with _session_or_temporary(session) as session:
             async with session.get(favicon_url, timeout=aiohttp.ClientTimeout(total=5)) as resp:
                 if resp.status == 200:
                     # Check if we got actual content (not a generic globe icon)
@@ -90,25 +154,31 @@ async def try_google_favicon(domain: str, website_url: str, size: int = 128) ->
                     # Google returns a ~726 byte generic globe icon for unknown domains
                     # Skip if content is too small (likely generic icon)
                     if content_length < 1000:
-                        print(f"ℹ️  Google favicon too small for {domain} ({content_length} bytes), likely generic icon")
+                        logger.debug("Google favicon too small for %s (%d bytes), likely generic icon", domain, content_length)
                         return None
                     
-                    print(f"✅ Google favicon found for {domain}: {favicon_url} ({content_length} bytes)")
+                    logger.info("Google favicon found for %s: %s (%d bytes)", domain, favicon_url, content_length)
                     return LogoResult(
                         url=favicon_url,
                         confidence=0.75,  # Lower confidence than Clearbit
                         description="Favicon from Google Favicon Service",
                         page_url=website_url,
-                        image_hash=hashlib.md5(content).hexdigest(),
+                        image_hash=_content_hash(content),
                         timestamp=datetime.now(),
                         is_header=True,
                         rank_score=1.5,  # Lower rank than Clearbit
                     )
     except Exception as e:
-        print(f"ℹ️  Google favicon unavailable for {domain}: {e}")
+        logger.debug("Google favicon unavailable for %s: %s", domain, e)
     return None
 
 
+# Only <meta> tags are built when looking for a refresh redirect
+META_TAG_STRAINER = SoupStrainer("meta")
+META_REFRESH_PATTERN = re.compile(r"refresh", re.I)
+META_REFRESH_URL_PATTERN = re.compile(r"url\s*=\s*([^\s;\"']+)", re.IGNORECASE)
+
+
 def extract_meta_refresh_url(html: str, base_url: str) -> Optional[str]:
     """Extract redirect URL from meta http-equiv="refresh" tag.
 
@@ -123,12 +193,12 @@ def extract_meta_refresh_url(html: str, base_url: str) -> Optional[str]:
     Returns:
         The redirect URL if found, None otherwise
     """
-    soup = BeautifulSoup(html, "html.parser")
-    meta_refresh = soup.find("meta", attrs={"http-equiv": re.compile(r"refresh", re.I)})
+    soup = BeautifulSoup(html, HTML_PARSER, parse_only=META_TAG_STRAINER)
+    meta_refresh = soup.find("meta", attrs={"http-equiv": META_REFRESH_PATTERN})
 
     if meta_refresh:
         content = meta_refresh.get("content", "")
-        match = re.search(r"url\s*=\s*([^\s;\"']+)", content, re.IGNORECASE)
+        match = META_REFRESH_URL_PATTERN.search(content)
         if match:
             redirect_url = match.group(1).strip("'\"")
             if redirect_url.startswith("/"):
@@ -153,6 +223,216 @@ BROWSER_HEADERS = {
     "Sec-Ch-Ua-Platform": '"macOS"',
 }
 
+# Image requests ask for images only, so servers can skip rendering HTML error pages
+IMAGE_REQUEST_HEADERS = {
+    **BROWSER_HEADERS,
+    "Accept": "image/avif,image/webp,image/apng,image/svg+xml,image/*;q=0.8",
+    "Sec-Fetch-Dest": "image",
+}
+
+# Content types that are never images (error and login pages, API errors), skipped unread
+NON_IMAGE_CONTENT_TYPES = frozenset({'text/html', 'application/xhtml+xml', 'application/json'})
+
+# Chunk size for streamed image downloads
+IMAGE_READ_CHUNK_SIZE = 64 * 1024
+
+# Size cap when downloading an already-ranked logo to save it; higher than
+# max_image_bytes, which only bounds what is worth sending for analysis
+MAX_SAVED_LOGO_BYTES = 20 * 1024 * 1024
+
+# Patterns for parsing gpt-4o-mini responses, compiled once at import
+CONFIDENCE_PREFIXES = ('confidence:', 'confidence score:')
+# One pass over the (lower-cased) reply; the regex engine tries both
+# alternatives at each position instead of running one search per format
+CONFIDENCE_PATTERN = re.compile(
+    r"confidence(?:\s+score)?\s*:[\s*_]*(\d*\.?\d+)"  # "Confidence Score: 0.9", "**Confidence:** 0.9"
+    r"|\A(\d*\.?\d+)(?=,|\s*-|$)"                     # "0.9, ...", "0.95 - ...", or just a number
+)
+DESCRIPTION_MARKER_PATTERN = re.compile(r"description:", re.IGNORECASE)
+# "Logo 3 ... score: 0.8" in ranking replies; the tempered dot stops a logo
+# without a score from borrowing the next logo's
+RANK_SCORE_PATTERN = re.compile(
+    r"Logo\s+(\d+)(?!\d)(?:(?!Logo\s+\d).)*?score:?\s*(\d*\.?\d+)",
+    re.IGNORECASE | re.DOTALL,
+)
+
+# Image URLs crawl_for_logos analyzes, by extension; a query string or fragment
+# may follow (logo.png?v=2)
+IMAGE_URL_PATTERN = re.compile(r"\.(?:jpe?g|png|gif|svg|webp)(?:[?#]|$)", re.IGNORECASE)
+SVG_URL_PATTERN = re.compile(r"\.svg(?:[?#]|$)", re.IGNORECASE)
+
+# Elements whose images count as header/navigation images
+HEADER_SELECTORS = (
+    'header',
+    'nav',
+    '[role="banner"]',
+    '.header',
+    '.nav',
+    '#header',
+    '#nav',
+    '.navbar',
+    '.site-header',
+    '.main-header',
+)
+# Selector list matching any of HEADER_SELECTORS, compiled once so header roots
+# take one select() call without re-parsing the selectors per page
+HEADER_SELECTOR = soupsieve.compile(', '.join(HEADER_SELECTORS))
+
+# url(...) values of background-image declarations in inline styles and <style> tags
+BACKGROUND_IMAGE_URL_PATTERN = re.compile(r"background-image:\s*url\((.*?)\)")
+
+# Keywords in a description or URL that indicate non-company logos (social media,
+# generic icons, etc.); every social media domain contains one of them
+NON_COMPANY_LOGO_KEYWORDS = (
+    'facebook', 'twitter', 'x.com', 'instagram', 'linkedin', 'youtube', 'tiktok',
+    'social media', 'share', 'like', 'follow', 'icon', 'button', 'arrow',
+    'menu', 'hamburger', 'search', 'magnifying glass', 'close', 'x mark',
+    'play', 'pause', 'stop', 'volume', 'mute', 'settings', 'gear',
+    'user', 'profile', 'account', 'login', 'logout', 'sign in', 'sign up',
+    'cart', 'shopping', 'bag', 'heart', 'favorite', 'star', 'rating',
+    'tag', 'price', 'discount', 'sale', 'new', 'hot', 'trending',
+)
+
+
+def _keywords_pattern(keywords) -> "re.Pattern":
+    """Compile keywords into one case-insensitive alternation scanned in a single pass."""
+    return re.compile('|'.join(re.escape(keyword) for keyword in keywords), re.IGNORECASE)
+
+
+# Chat completion endpoints
+AZURE_CHAT_COMPLETIONS_URL = "https://scailetech.openai.azure.com/openai/deployments/gpt-4o-mini/chat/completions?api-version=2024-06-01"
+OPENAI_CHAT_COMPLETIONS_URL = "https://api.openai.com/v1/chat/completions"
+
+# Prompt parts shared by every logo-detection request (treat as read-only)
+LOGO_SYSTEM_MESSAGE = {
+    "role": "system",
+    "content": "You are a logo detection assistant. Analyze the image and determine if it's a logo. Respond with a JSON object of the form {\"is_logo\": true|false, \"confidence\": 0.0-1.0, \"description\": \"...\"}."
+}
+LOGO_BATCH_SYSTEM_MESSAGE = {
+    "role": "system",
+    "content": "You are a logo detection assistant. You will receive several images, each preceded by its index. For every image determine if it's a logo. Respond with a JSON object of the form {\"results\": [{\"index\": 0, \"is_logo\": true|false, \"confidence\": 0.0-1.0, \"description\": \"...\"}]} containing one entry per image."
+}
+LOGO_USER_TEXT_PART = {
+    "type": "text",
+    "text": "Is this image a logo? Reply with JSON: set is_logo, a confidence score (0-1), and a brief description of what makes it a logo (empty if it is not a logo)."
+}
+
+# Images sent per chat completion request when analyzing a page's images
+ANALYSIS_BATCH_SIZE = 6
+
+# Default number of concurrent page-fetch workers used by crawl_for_logos
+PAGE_WORKERS = 8
+
+# API responses worth retrying (rate limits and transient server errors)
+RETRYABLE_STATUSES = frozenset({429, 500, 502, 503, 504})
+# Transport failures worth retrying (connection resets, truncated bodies, timeouts)
+RETRYABLE_ERRORS = (aiohttp.ClientConnectionError, aiohttp.ClientPayloadError, asyncio.TimeoutError)
+MAX_API_ATTEMPTS = 4
+
+# Longest server-requested Retry-After honoured, so one response can't stall a worker for long
+MAX_RETRY_AFTER_SECONDS = 30.0
+
+# Maximum number of image URL -> content hash mappings remembered per crawler
+URL_HASH_CACHE_SIZE = 4096
+
+# Content hashes whose public upload URL CloudStorage remembers (LRU); older
+# images are uploaded again (overwriting the same object) if they come back
+UPLOADED_URLS_CACHE_SIZE = 4096
+
+# System prompt for rank_logos; replies are a JSON object of per-logo scores
+RANK_SYSTEM_MESSAGE = {
+    "role": "system",
+    "content": "You are a logo ranking assistant. Analyze the provided logos and rank them based on their likelihood of being the main company logo. Consider:\n1. Location (header/nav logos are more likely)\n2. Confidence score\n3. Description (looking for company name, branding elements)\n4. Professional design indicators\nRespond with a JSON object of the form {\"rankings\": [{\"index\": 1, \"score\": 0.0-1.0}]} containing one entry per logo."
+}
+# Descriptions are truncated in the ranking prompt to keep it bounded
+RANK_DESCRIPTION_MAX_CHARS = 200
+
+# CSV headers recognized as the URL column by detect_url_column, in partial-match order
+URL_COLUMN_HEADERS = (
+    'url', 'website', 'site', 'link', 'domain', 'company url',
+    'website url', 'site url', 'company website', 'company site',
+    'web', 'webpage', 'page', 'address', 'homepage'
+)
+# Set form of URL_COLUMN_HEADERS for exact header matches
+URL_COLUMN_HEADER_SET = frozenset(URL_COLUMN_HEADERS)
+
+# CSV cell values treated as a missing URL (compared lowercased)
+EMPTY_URL_VALUES = frozenset({'', 'nan', 'none', 'null'})
+
+# Timeout shared by all requests made through the crawler's HTTP session
+HTTP_TIMEOUT = aiohttp.ClientTimeout(total=60)
+
+# PIL formats the vision API accepts as-is, so downloaded bytes can be sent without re-encoding
+API_IMAGE_FORMATS = frozenset({'PNG', 'JPEG', 'GIF', 'WEBP'})
+
+# Data URL prefixes for the image formats the vision API accepts, keyed by MIME type
+DATA_URL_PREFIXES = {
+    mime: f"data:{mime};base64,"
+    for mime in ('image/png', 'image/jpeg', 'image/gif', 'image/webp')
+}
+
+
+def _sniff_image_mime(image_data: bytes) -> str:
+    """Return the MIME type of image_data from its magic bytes, defaulting to PNG."""
+    if image_data[:3] == b'\xff\xd8\xff':
+        return 'image/jpeg'
+    if image_data[:6] in (b'GIF87a', b'GIF89a'):
+        return 'image/gif'
+    if image_data[:4] == b'RIFF' and image_data[8:12] == b'WEBP':
+        return 'image/webp'
+    return 'image/png'
+
+
+# JPEG start-of-frame markers, which carry the image dimensions (C4, C8 and CC are not frames)
+JPEG_SOF_MARKERS = frozenset(range(0xC0, 0xD0)) - {0xC4, 0xC8, 0xCC}
+
+
+def _probe_image_size(image_data: bytes) -> Optional[Tuple[int, int]]:
+    """Read (width, height) from PNG, GIF or JPEG headers without decoding.
+    
+    Returns None for other formats or truncated headers, so callers can
+    fall back to PIL.
+    """
+    if image_data[:8] == b'\x89PNG\r\n\x1a\n' and image_data[12:16] == b'IHDR' and len(image_data) >= 24:
+        return struct.unpack('>II', image_data[16:24])
+    if image_data[:6] in (b'GIF87a', b'GIF89a') and len(image_data) >= 10:
+        return struct.unpack('<HH', image_data[6:10])
+    if image_data[:2] == b'\xff\xd8':
+        # Walk the segment headers up to the first frame header
+        offset = 2
+        while offset + 9 <= len(image_data):
+            if image_data[offset] != 0xFF:
+                return None
+            marker = image_data[offset + 1]
+            if marker == 0xFF:  # Fill byte before a marker
+                offset += 1
+                continue
+            if marker in JPEG_SOF_MARKERS:
+                height, width = struct.unpack('>HH', image_data[offset + 5:offset + 9])
+                return width, height
+            offset += 2 + struct.unpack('>H', image_data[offset + 2:offset + 4])[0]
+    return None
+
+
+# Leading bytes of raster formats the crawler can convert (SVG is sniffed separately)
+IMAGE_SIGNATURES = (
+    b'\x89PNG\r\n\x1a\n',  # PNG
+    b'\xff\xd8\xff',         # JPEG
+    b'GIF87a', b'GIF89a',
+    b'BM',                   # BMP
+    b'\x00\x00\x01\x00',     # ICO
+)
+
+
+def _looks_like_image(image_data: bytes) -> bool:
+    """Check the leading bytes of a body served without an image/* Content-Type."""
+    return (
+        image_data.startswith(IMAGE_SIGNATURES)
+        or (image_data[:4] == b'RIFF' and image_data[8:12] == b'WEBP')
+        or is_svg(image_data)
+    )
+
+
 # Use secure SSL context by default - removed insecure SSL bypass
 # If you need to handle self-signed certificates, use proper certificate validation
 def create_secure_ssl_context():
@@ -171,66 +451,241 @@ class LogoResult(BaseModel):
     detection_scores: Dict[str, Dict[str, float]] = {}
 
 class ImageCache:
-    def __init__(self, cache_duration: timedelta = timedelta(days=1)):
-        self.cache: Dict[str, LogoResult] = {}
+    """LRU cache of analysis results keyed by image content hash.
+    
+    Entries store a time.monotonic() deadline alongside the result, so
+    lookups compare two floats instead of building datetimes, and expiry
+    is unaffected by wall-clock adjustments. Every entry lives for the same
+    duration, so a second map in insertion order is also in deadline order;
+    expired entries are dropped from its front without scanning the cache.
+    
+    Results are copied in and out, so callers can set page-specific fields
+    (is_header, rank_score) without changing what later lookups see.
+    
+    Images known not to be logos (rejected by the API, too small, photos)
+    are remembered separately, by default for the same duration, so they
+    aren't sent to the API again.
+    """
+
+    __slots__ = ("cache", "negative", "cache_duration", "negative_duration", "max_entries",
+                 "max_negative_entries", "_ttl_seconds", "_negative_ttl_seconds", "_deadlines")
+
+    def __init__(self, cache_duration: timedelta = timedelta(days=1), max_entries: int = 1024,
+                 max_negative_entries: int = 4096, negative_duration: Optional[timedelta] = None):
+        self.cache: "OrderedDict[str, Tuple[float, LogoResult]]" = OrderedDict()
+        # Deadline per cached hash, earliest first; get() reorders cache but not this
+        self._deadlines: "OrderedDict[str, float]" = OrderedDict()
+        # Negatives are never reordered by lookups, so this map is itself in deadline order
+        self.negative: "OrderedDict[str, float]" = OrderedDict()
         self.cache_duration = cache_duration
+        self.max_entries = max_entries
+        self.max_negative_entries = max_negative_entries
+        self._ttl_seconds = cache_duration.total_seconds()
+        # Negatives can be given a shorter lifetime than results, so a site that
+        # swaps an image in place is re-checked sooner
+        self.negative_duration = cache_duration if negative_duration is None else negative_duration
+        self._negative_ttl_seconds = self.negative_duration.total_seconds()
 
     def get(self, image_hash: str) -> Optional[LogoResult]:
-        if image_hash in self.cache:
-            result = self.cache[image_hash]
-            if datetime.now() - result.timestamp < self.cache_duration:
-                return result
-        return None
+        entry = self.cache.get(image_hash)
+        if entry is None:
+            return None
+        expires_at, result = entry
+        if time.monotonic() >= expires_at:
+            del self.cache[image_hash]
+            del self._deadlines[image_hash]
+            return None
+        self.cache.move_to_end(image_hash)
+        return result.model_copy()
 
     def set(self, image_hash: str, result: LogoResult):
-        self.cache[image_hash] = result
+        now = time.monotonic()
+        # Drop expired entries first, so stale results don't hold capacity
+        # until they're looked up and live ones aren't evicted in their place
+        while self._deadlines:
+            oldest_hash, expires_at = next(iter(self._deadlines.items()))
+            if expires_at > now:
+                break
+            del self._deadlines[oldest_hash]
+            del self.cache[oldest_hash]
+        
+        expires_at = now + self._ttl_seconds
+        self.cache[image_hash] = (expires_at, result.model_copy())
+        self.cache.move_to_end(image_hash)
+        self._deadlines[image_hash] = expires_at
+        self._deadlines.move_to_end(image_hash)
+        # Evict least recently used entries once over capacity
+        while len(self.cache) > self.max_entries:
+            evicted_hash, _ = self.cache.popitem(last=False)
+            del self._deadlines[evicted_hash]
+
+    def is_negative(self, image_hash: str) -> bool:
+        """Check whether the image was recently found not to be a logo."""
+        expires_at = self.negative.get(image_hash)
+        if expires_at is None:
+            return False
+        if time.monotonic() >= expires_at:
+            del self.negative[image_hash]
+            return False
+        return True
+
+    def mark_negative(self, image_hash: str):
+        """Remember that the image isn't a logo until the negative duration passes."""
+        now = time.monotonic()
+        while self.negative:
+            oldest_hash, expires_at = next(iter(self.negative.items()))
+            if expires_at > now:
+                break
+            del self.negative[oldest_hash]
+        self.negative[image_hash] = now + self._negative_ttl_seconds
+        self.negative.move_to_end(image_hash)
+        while len(self.negative) > self.max_negative_entries:
+            self.negative.popitem(last=False)
+
+    def save(self, path: str):
+        """Write unexpired entries to a JSON file, least recently used first.
+        
+        Monotonic deadlines don't survive a restart, so entries are stored
+        with a wall-clock expiry time instead.
+        """
+        now_monotonic = time.monotonic()
+        now_wall = time.time()
+        entries = [
+            {
+                "image_hash": image_hash,
+                "expires_at": now_wall + (expires_at - now_monotonic),
+                "result": result.model_dump(mode="json"),
+            }
+            for image_hash, (expires_at, result) in self.cache.items()
+            if expires_at > now_monotonic
+        ]
+        negatives = [
+            {"image_hash": image_hash, "expires_at": now_wall + (expires_at - now_monotonic)}
+            for image_hash, expires_at in self.negative.items()
+            if expires_at > now_monotonic
+        ]
+        output_path = Path(path).expanduser()
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+        # Write to a temporary file first so a crash never leaves a truncated cache
+        tmp_path = output_path.with_name(output_path.name + ".tmp")
+        tmp_path.write_bytes(_json_dumps({"entries": entries, "negatives": negatives}))
+        os.replace(tmp_path, output_path)
+
+    def load(self, path: str):
+        """Load entries written by save(), skipping expired or malformed ones.
+        
+        A missing or unreadable file leaves the cache unchanged.
+        """
+        try:
+            data = _json_loads(Path(path).expanduser().read_bytes())
+            entries = data["entries"]
+            negatives = data.get("negatives", [])
+        except (OSError, ValueError, KeyError, TypeError, AttributeError):
+            return
+        now_monotonic = time.monotonic()
+        now_wall = time.time()
+        for entry in entries:
+            try:
+                remaining = float(entry["expires_at"]) - now_wall
+                if remaining <= 0:
+                    continue
+                result = LogoResult.model_validate(entry["result"])
+                # Entries from the same page would otherwise each hold their own copy
+                result.page_url = sys.intern(result.page_url)
+                self.cache[entry["image_hash"]] = (now_monotonic + min(remaining, self._ttl_seconds), result)
+            except (KeyError, TypeError, ValueError):
+                continue
+        while len(self.cache) > self.max_entries:
+            self.cache.popitem(last=False)
+        # Loaded deadlines vary, so restore deadline order once here
+        self._deadlines = OrderedDict(
+            sorted(((image_hash, expires_at) for image_hash, (expires_at, _) in self.cache.items()),
+                   key=lambda item: item[1])
+        )
+        for entry in negatives:
+            try:
+                remaining = float(entry["expires_at"]) - now_wall
+                if remaining > 0:
+                    self.negative[entry["image_hash"]] = now_monotonic + min(remaining, self._negative_ttl_seconds)
+            except (KeyError, TypeError, ValueError):
+                continue
+        self.negative = OrderedDict(sorted(self.negative.items(), key=lambda item: item[1]))
+        while len(self.negative) > self.max_negative_entries:
+            self.negative.popitem(last=False)
 
 class CloudStorage:
+    __slots__ = ("supabase_url", "supabase_key", "client", "_uploaded_urls")
+
     def __init__(self, supabase_url: Optional[str] = None, supabase_key: Optional[str] = None):
         """Initialize cloud storage for uploading background-removed images."""
         self.supabase_url = supabase_url
         self.supabase_key = supabase_key
         self.client: Optional[Client] = None
+        # Public URLs of images uploaded by this instance, keyed by content hash (LRU)
+        self._uploaded_urls: "OrderedDict[str, str]" = OrderedDict()
         
         if SUPABASE_AVAILABLE and supabase_url and supabase_key:
             try:
                 self.client = create_client(supabase_url, supabase_key)
-                print("✅ Supabase cloud storage initialized")
+                logger.info("Supabase cloud storage initialized")
             except Exception as e:
-                print(f"⚠️  Failed to initialize Supabase: {e}")
+                logger.warning("Failed to initialize Supabase: %s", e)
                 self.client = None
         else:
-            print("⚠️  Supabase not configured - images will be stored locally only")
+            logger.info("Supabase not configured - images will be stored locally only")
     
     async def upload_image(self, image_data: bytes, filename: str) -> Optional[str]:
-        """Upload image to cloud storage and return public URL."""
+        """Upload image to cloud storage and return public URL.
+        
+        Objects are named by content hash (keeping filename's extension), so
+        identical images share one object and are uploaded once while their
+        URL is remembered (the last UPLOADED_URLS_CACHE_SIZE images); later
+        re-uploads overwrite the same object.
+        The Supabase client is synchronous, so its calls run in a worker
+        thread and concurrent uploads don't block the event loop.
+        """
         if not self.client:
             return None
+        
+        image_hash = _content_hash(image_data)
+        public_url = self._uploaded_urls.get(image_hash)
+        if public_url is not None:
+            self._uploaded_urls.move_to_end(image_hash)
+            return public_url
             
         try:
-            # Upload to Supabase storage
-            bucket_name = "logo-images"
-            file_path = f"background-removed/{filename}"
-            
-            # Ensure bucket exists (this would need to be created manually in Supabase dashboard)
-            result = self.client.storage.from_(bucket_name).upload(
-                path=file_path,
-                file=image_data,
-                file_options={"content-type": "image/png"}
-            )
-            
-            # Get public URL
-            public_url = self.client.storage.from_(bucket_name).get_public_url(file_path)
+            file_path = f"background-removed/{image_hash}{Path(filename).suffix or '.png'}"
+            public_url = await asyncio.to_thread(self._upload_sync, image_data, file_path)
+            self._uploaded_urls[image_hash] = public_url
+            if len(self._uploaded_urls) > UPLOADED_URLS_CACHE_SIZE:
+                self._uploaded_urls.popitem(last=False)
             return public_url
             
         except Exception as e:
-            print(f"⚠️  Failed to upload to cloud storage: {e}")
+            logger.warning("Failed to upload to cloud storage: %s", e)
             return None
 
+    def _upload_sync(self, image_data: bytes, file_path: str) -> str:
+        """Upload to Supabase storage and return the public URL; blocking, so call via a thread."""
+        bucket_name = "logo-images"
+        
+        # Ensure bucket exists (this would need to be created manually in Supabase dashboard)
+        self.client.storage.from_(bucket_name).upload(
+            path=file_path,
+            file=image_data,
+            file_options={"content-type": "image/png", "upsert": "true"}
+        )
+        
+        # Get public URL
+        return self.client.storage.from_(bucket_name).get_public_url(file_path)
+
 class LogoCrawler:
     def __init__(self, api_key: Optional[str] = None, twitter_api_key: Optional[str] = None, 
                  use_azure: bool = False, supabase_url: Optional[str] = None, 
-                 supabase_key: Optional[str] = None):
+                 supabase_key: Optional[str] = None, max_concurrency: int = 32,
+                 cache_path: Optional[str] = None, cache_size: int = 1024,
+                 verbose: bool = False, max_image_concurrency: int = 20,
+                 cpu_workers: int = 0, max_page_concurrency: int = PAGE_WORKERS):
         """
         Initialize the LogoCrawler.
         
@@ -242,6 +697,18 @@ class LogoCrawler:
             use_azure: Set to True if using Azure OpenAI, False for regular OpenAI (default: False)
             supabase_url: Optional Supabase URL for cloud storage of background-removed images
             supabase_key: Optional Supabase key for cloud storage
+            max_concurrency: Maximum number of OpenAI requests in flight at once (default: 32)
+            cache_path: Optional JSON file to persist the analysis cache in. It is loaded
+                        here and written back by close(), so repeat crawls skip API calls
+                        for images already analyzed.
+            cache_size: Maximum number of analysis results kept in memory (default: 1024)
+            verbose: Print a report of the ranked logos after each crawl_website call (default: False)
+            max_image_concurrency: Maximum number of images downloaded and prepared at once (default: 20)
+            cpu_workers: Number of worker processes for background removal and SVG rendering.
+                         0 runs them in the image-preparation threads instead (default: 0).
+                         Each process loads its own rembg model.
+            max_page_concurrency: Maximum number of pages crawl_for_logos fetches and
+                                  parses at once (default: 8)
         """
         if not api_key:
             raise ValueError(
@@ -251,438 +718,830 @@ class LogoCrawler:
             )
         self.api_key = api_key
         self.use_azure = use_azure
+        self.verbose = verbose
+        
+        # Endpoint, auth headers and extra body fields are fixed for the crawler's
+        # lifetime, so build them once; Azure selects the model by deployment URL
+        if use_azure:
+            self._chat_url = AZURE_CHAT_COMPLETIONS_URL
+            self._api_headers = {'Content-Type': 'application/json', 'api-key': api_key}
+            self._api_extra_body: Dict[str, str] = {}
+        else:
+            self._chat_url = OPENAI_CHAT_COMPLETIONS_URL
+            self._api_headers = {'Content-Type': 'application/json', 'Authorization': f'Bearer {api_key}'}
+            self._api_extra_body = {"model": "gpt-4o-mini"}
         
         # Initialize image cache, detection strategies, and cloud storage
-        self.image_cache = ImageCache()
+        self.image_cache = ImageCache(max_entries=cache_size)
+        self.cache_path = cache_path
+        if cache_path:
+            self.image_cache.load(cache_path)
         self.detection_strategies = LogoDetectionStrategies(twitter_api_key)
         self.cloud_storage = CloudStorage(supabase_url, supabase_key)
         
+        # Shared HTTP session, created lazily on first use so keep-alive
+        # connections to the API host are reused across analyzer calls
+        self._session: Optional[aiohttp.ClientSession] = None
+        
+        # Cap in-flight API requests so large crawls don't exhaust the connection pool
+        self.max_concurrency = max_concurrency
+        
+        # Cap concurrent image downloads and preparation when fanning out over a page
+        self.max_image_concurrency = max_image_concurrency
+        
+        # Semaphores enforcing the two caps, created in the running event loop
+        # (see _get_semaphore); name -> (loop, semaphore)
+        self._semaphores: Dict[str, Tuple[asyncio.AbstractEventLoop, asyncio.Semaphore]] = {}
+        
+        # Number of crawl_for_logos workers fetching and parsing pages at once
+        self.max_page_concurrency = max_page_concurrency
+        
+        # Process pool for CPU-heavy image work, created on first use when cpu_workers > 0
+        self.cpu_workers = cpu_workers
+        self._cpu_pool: Optional[concurrent.futures.ProcessPoolExecutor] = None
+        self._cpu_pool_lock = threading.Lock()
+
+        # Analyses in progress, keyed by image hash, so concurrent requests for
+        # the same bytes share a single API call
+        self._inflight: Dict[str, "asyncio.Future[Optional[LogoResult]]"] = {}
+        
+        # Image URL -> content hash (LRU), so images repeated across pages
+        # are served from the cache without being downloaded and hashed again
+        self._url_hashes: "OrderedDict[str, str]" = OrderedDict()
+        
         # Minimum image dimensions
         self.min_width = 32
         self.min_height = 32
         
+        # Images larger than this are skipped before their body is downloaded
+        self.max_image_bytes = 2 * 1024 * 1024
+        
+        # Skip large, high-entropy images (photos, hero banners) without an API call
+        self.skip_photos = True
+        self.photo_min_pixels = 500_000
+        self.photo_min_entropy = 6.5
+        
         # Keywords that indicate non-company logos (social media, generic icons, etc.)
-        self.non_company_logo_keywords = [
-            'facebook', 'twitter', 'x.com', 'instagram', 'linkedin', 'youtube', 'tiktok',
-            'social media', 'share', 'like', 'follow', 'icon', 'button', 'arrow',
-            'menu', 'hamburger', 'search', 'magnifying glass', 'close', 'x mark',
-            'play', 'pause', 'stop', 'volume', 'mute', 'settings', 'gear',
-            'user', 'profile', 'account', 'login', 'logout', 'sign in', 'sign up',
-            'cart', 'shopping', 'bag', 'heart', 'favorite', 'star', 'rating',
-            'tag', 'price', 'discount', 'sale', 'new', 'hot', 'trending'
-        ]
+        self.non_company_logo_keywords = list(NON_COMPANY_LOGO_KEYWORDS)
+        # Compiled from the keywords above; rebuilt by is_company_logo if they're changed
+        self._non_company_logo_key = tuple(self.non_company_logo_keywords)
+        self._non_company_logo_pattern = _keywords_pattern(self._non_company_logo_key)
+        
+    def _get_session(self) -> aiohttp.ClientSession:
+        """Return the shared HTTP session, creating it on first use."""
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(
+                limit=self.max_concurrency * 2,
+                limit_per_host=self.max_concurrency,
+                ttl_dns_cache=300,
+                keepalive_timeout=60,
+            )
+            self._session = aiohttp.ClientSession(connector=connector, timeout=HTTP_TIMEOUT)
+        return self._session
+
+    def _get_semaphore(self, name: str, limit: int) -> asyncio.Semaphore:
+        """Return the named semaphore for the running event loop, creating it on first use.
         
+        Not created in __init__: on Python 3.9 a semaphore binds to the loop that is
+        current when it's constructed, so one built outside asyncio.run fails under
+        contention. A crawler reused across asyncio.run calls gets new ones per loop.
+        """
+        loop = asyncio.get_running_loop()
+        entry = self._semaphores.get(name)
+        if entry is None or entry[0] is not loop:
+            entry = self._semaphores[name] = (loop, asyncio.Semaphore(limit))
+        return entry[1]
+
+    async def close(self):
+        """Close the shared HTTP session and release pooled connections.
+        
+        Also writes the analysis cache to cache_path, if one was given.
+        """
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+        await self.detection_strategies.close()
+        if self._cpu_pool is not None:
+            self._cpu_pool.shutdown(wait=False, cancel_futures=True)
+            self._cpu_pool = None
+        if self.cache_path:
+            try:
+                self.image_cache.save(self.cache_path)
+            except OSError as e:
+                logger.error("Error saving image cache to %s: %s", self.cache_path, e)
+
+    async def __aenter__(self) -> "LogoCrawler":
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.close()
+
     def get_image_hash(self, image_data: bytes) -> str:
-        """Generate a hash for an image to use as cache key."""
-        return hashlib.md5(image_data).hexdigest()
+        """Generate a hash for an image to use as cache key (see _content_hash)."""
+        return _content_hash(image_data)
         
     def is_valid_image_size(self, image: Image.Image) -> bool:
         """Check if image dimensions are suitable for logo detection."""
         width, height = image.size
         return width >= self.min_width and height >= self.min_height
+
+    def looks_like_photo(self, image: Image.Image) -> bool:
+        """Cheaply flag images that are almost certainly photos rather than logos.
+        
+        Logos are flat-colored with a narrow histogram, so an image that is
+        both large and has a high grayscale entropy is treated as a photo.
+        Entropy is measured on a roughly 256px sample to keep the check cheap.
+        
+        A JPEG that hasn't been loaded yet is decoded straight to a reduced
+        grayscale image via Image.draft, which changes image in place; callers
+        keep the original encoded bytes for anything after this check.
+        """
+        width, height = image.size
+        if width * height < self.photo_min_pixels:
+            return False
+        
+        # JPEG decodes at 1/2-1/8 scale when asked before loading; a no-op otherwise
+        image.draft('L', (256, 256))
+        sample = image if image.mode in ('L', 'RGB', 'RGBA') else image.convert('L')
+        # reduce() box-downsamples without first copying the full-size bitmap
+        factor = max(sample.size) // 256
+        if factor > 1:
+            sample = sample.reduce(factor)
+        return sample.convert('L').entropy() > self.photo_min_entropy
     
     def is_company_logo(self, description: str, url: str) -> bool:
         """Check if the logo is likely a company logo (not social media, generic icons, etc.)."""
         if not description:
             return True  # If no description, assume it's a company logo
         
-        description_lower = description.lower()
-        url_lower = url.lower()
-        
-        # Check for non-company logo keywords
-        for keyword in self.non_company_logo_keywords:
-            if keyword in description_lower or keyword in url_lower:
-                return False
-        
-        # Check for social media domains in URL
-        social_domains = ['facebook.com', 'twitter.com', 'x.com', 'instagram.com', 
-                         'linkedin.com', 'youtube.com', 'tiktok.com']
-        for domain in social_domains:
-            if domain in url_lower:
-                return False
+        keywords = tuple(self.non_company_logo_keywords)
+        if keywords != self._non_company_logo_key:
+            self._non_company_logo_key = keywords
+            self._non_company_logo_pattern = _keywords_pattern(keywords)
         
-        return True
+        # Check for non-company logo keywords, social media domains included
+        pattern = self._non_company_logo_pattern
+        return pattern.search(description) is None and pattern.search(url) is None
 
     def remove_background(self, image: Image.Image) -> Image.Image:
         """Remove background from image using rembg."""
         if not REMBG_AVAILABLE:
             return image
         
-        try:
-            # Convert PIL image to bytes
-            img_byte_arr = io.BytesIO()
-            image.save(img_byte_arr, format='PNG')
-            img_byte_arr = img_byte_arr.getvalue()
-            
-            # Remove background
-            output = remove(img_byte_arr)
-            
-            # Convert back to PIL image
-            return Image.open(io.BytesIO(output))
-        except Exception as e:
-            print(f"Background removal failed: {e}")
+        # Convert PIL image to bytes
+        img_byte_arr = io.BytesIO()
+        image.save(img_byte_arr, format='PNG')
+        
+        output = self.remove_background_bytes(img_byte_arr.getvalue())
+        if output is None:
             return image
+        
+        # Convert back to PIL image
+        return Image.open(io.BytesIO(output))
 
-    def extract_confidence_score(self, content: str) -> float:
-        """Extract confidence score from gpt-4o-mini response using various patterns."""
-        # Try different patterns to find confidence score
-        patterns = [
-            r"confidence score:\s*(\d*\.?\d+)",  # "Confidence Score: 0.9"
-            r"confidence:\s*(\d*\.?\d+)",        # "Confidence: 0.9"
-            r"^(\d*\.?\d+),\s*",                # "0.9, This image..."
-            r"^(\d*\.?\d+)\s*-\s*",             # "0.95 - The image..."
-            r"^(\d*\.?\d+)$",                    # Just a number
-        ]
+    def _run_cpu(self, fn, *args):
+        """Run fn(*args) in the process pool if cpu_workers > 0, otherwise in the calling thread.
         
-        # First, try to find the confidence score in a dedicated line
-        lines = content.split('\n')
-        for line in lines:
-            line = line.lower().strip()
-            if line.startswith(('confidence:', 'confidence score:')):
-                try:
-                    score = float(re.search(r"(\d*\.?\d+)", line).group(1))
-                    return score
-                except (ValueError, AttributeError):
-                    continue
+        Blocks until fn returns, so call it from a worker thread rather than the event loop.
+        """
+        if self.cpu_workers <= 0:
+            return fn(*args)
+        with self._cpu_pool_lock:
+            if self._cpu_pool is None:
+                # The pool is created from a worker thread while the event loop runs;
+                # forking a process with live threads can deadlock, so start workers
+                # from a clean server process (or spawn them where that's unavailable)
+                method = 'forkserver' if 'forkserver' in multiprocessing.get_all_start_methods() else 'spawn'
+                self._cpu_pool = concurrent.futures.ProcessPoolExecutor(
+                    max_workers=self.cpu_workers, mp_context=multiprocessing.get_context(method),
+                )
+            pool = self._cpu_pool
+        return pool.submit(fn, *args).result()
+
+    def remove_background_bytes(self, image_data: bytes) -> Optional[bytes]:
+        """Remove background from encoded image bytes using rembg.
         
-        # Then try the patterns on the entire content
-        content_lower = content.lower()
-        for pattern in patterns:
-            match = re.search(pattern, content_lower)
-            if match:
-                try:
-                    return float(match.group(1))
-                except (ValueError, IndexError):
-                    continue
+        rembg decodes any format PIL can read and returns PNG bytes, so
+        callers holding encoded bytes can skip the PIL round trip.
+        Returns None if rembg is unavailable or fails.
+        """
+        if not REMBG_AVAILABLE:
+            return None
         
+        try:
+            return self._run_cpu(_remove_background, image_data)
+        except Exception as e:
+            logger.warning("Background removal failed: %s", e)
+            return None
+
+    def extract_confidence_score(self, content: str, content_lower: Optional[str] = None) -> float:
+        """Extract confidence score from gpt-4o-mini response using various patterns.
+        
+        content_lower may be passed when the caller already has a lower-cased copy.
+        """
+        if content_lower is None:
+            content_lower = content.lower()
+        
+        match = CONFIDENCE_PATTERN.search(content_lower.strip())
+        if match:
+            return float(match.group(1) or match.group(2))
         return 0.0
 
-    def extract_description(self, content: str) -> str:
-        """Extract description from gpt-4o-mini response."""
+    def extract_description(self, content: str, content_lower: Optional[str] = None) -> str:
+        """Extract description from gpt-4o-mini response.
+        
+        content_lower may be passed when the caller already has a lower-cased copy.
+        """
         # Try to find description after "Description:" marker
-        if "description:" in content.lower():
-            parts = content.split("Description:", 1)
-            if len(parts) > 1:
-                return parts[1].strip()
+        parts = DESCRIPTION_MARKER_PATTERN.split(content, 1)
+        if len(parts) > 1:
+            return parts[1].strip()
+        
+        if content_lower is None:
+            content_lower = content.lower()
         
         # If no description marker found, remove confidence score if present
-        lines = content.split('\n')
         filtered_lines = []
-        for line in lines:
+        for line, line_lower in zip(content.split('\n'), content_lower.split('\n')):
             line = line.strip()
             if not line:
                 continue
-            if line.lower().startswith(('confidence:', 'confidence score:')):
+            if line_lower.strip().startswith(CONFIDENCE_PREFIXES):
                 continue
             filtered_lines.append(line)
         
         return ' '.join(filtered_lines)
 
-    async def analyze_image_with_openai(self, image_base64: str, image_url: str, page_url: str, html_element: Optional[Tag] = None, page_html: Optional[str] = None) -> Optional[LogoResult]:
-        """Analyze an image using OpenAI API (regular or Azure) and additional detection strategies."""
-        if self.use_azure:
-            return await self._analyze_image_with_azure(image_base64, image_url, page_url, html_element, page_html)
-        else:
-            return await self._analyze_image_with_regular_openai(image_base64, image_url, page_url, html_element, page_html)
+    def parse_logo_analysis(self, content: str) -> Optional[Tuple[float, str]]:
+        """Parse a logo-detection reply into (confidence, description).
+        
+        Replies are requested as a JSON object, which is read directly. Free-form
+        replies ('Confidence Score: X.XX\nDescription: ...' or 'null') still go
+        through the regex extractors. Returns None if the image is not a logo.
+        """
+        content = content.strip()
+        if content.startswith('{'):
+            try:
+                parsed = _json_loads(content)
+            except json.JSONDecodeError:
+                parsed = None
+            if isinstance(parsed, dict):
+                return self._analysis_from_dict(parsed)
+        
+        # Cheap length check first so long replies skip the lower-casing
+        if len(content) <= 6 and content.strip("'\"").lower() == "null":
+            return None
+        
+        # Lower-case once and share it between both extractors
+        content_lower = content.lower()
+        return (
+            self.extract_confidence_score(content, content_lower),
+            self.extract_description(content, content_lower),
+        )
 
-    async def _analyze_image_with_azure(self, image_base64: str, image_url: str, page_url: str, html_element: Optional[Tag] = None, page_html: Optional[str] = None) -> Optional[LogoResult]:
-        """Analyze an image using Azure OpenAI gpt-4o-mini and additional detection strategies."""
-        url = "https://scailetech.openai.azure.com/openai/deployments/gpt-4o-mini/chat/completions?api-version=2023-03-15-preview"
+    def _analysis_from_dict(self, parsed: Dict) -> Optional[Tuple[float, str]]:
+        """Read (confidence, description) from a JSON analysis object, or None if not a logo."""
+        if not parsed.get("is_logo"):
+            return None
+        try:
+            confidence = float(parsed.get("confidence", 0.0))
+        except (TypeError, ValueError):
+            confidence = 0.0
+        return confidence, str(parsed.get("description") or "").strip()
+
+    def _image_url_part(self, image_data: bytes) -> Dict:
+        """Build the image_url content part for an image.
         
-        messages = [
-            {"role": "system", "content": "You are a logo detection assistant. Analyze the image and determine if it's a logo. If it is, provide a confidence score (0-1) and description in this format: 'Confidence Score: X.XX\nDescription: ...'. If not, return 'null'."},
+        This is the only place image bytes are base64-encoded for the API.
+        The data URL carries the sniffed MIME type so the image is not
+        mislabelled as PNG.
+        """
+        prefix = DATA_URL_PREFIXES[_sniff_image_mime(image_data)]
+        return {
+            "type": "image_url",
+            "image_url": {
+                "url": prefix + base64.b64encode(image_data).decode('ascii')
+            }
+        }
+
+    def _build_messages(self, image_data: bytes) -> List[Dict]:
+        """Build the chat messages for a single-image logo check.
+        
+        The system message and text prompt are shared module-level dicts;
+        only the image part is built per call.
+        """
+        return [
+            LOGO_SYSTEM_MESSAGE,
             {
                 "role": "user",
                 "content": [
-                    {
-                        "type": "text",
-                        "text": "Is this image a logo? If yes, provide a confidence score (0-1) and a brief description of what makes it a logo. Format your response as 'Confidence Score: X.XX\nDescription: ...'. If no, return null."
-                    },
-                    {
-                        "type": "image_url",
-                        "image_url": {
-                            "url": f"data:image/png;base64,{image_base64}"
-                        }
-                    }
+                    LOGO_USER_TEXT_PART,
+                    self._image_url_part(image_data)
                 ]
             }
         ]
 
-        data = {
-            "messages": messages,
-            "max_tokens": 300
-        }
-
-        headers = {
-            'Content-Type': 'application/json',
-            'api-key': self.api_key
-        }
+    @staticmethod
+    def _retry_delay(attempt: int, retry_after: Optional[str] = None) -> float:
+        """Seconds to wait before retry number attempt + 1, at most MAX_RETRY_AFTER_SECONDS for Retry-After."""
+        if retry_after:
+            try:
+                return min(max(float(retry_after), 0.0), MAX_RETRY_AFTER_SECONDS)
+            except ValueError:
+                pass  # HTTP-date form; fall back to exponential backoff
+        # Jitter only spreads retries out; it isn't security-sensitive
+        return (2 ** attempt) * 0.25 + random.random() * 0.1  # nosec B311
 
-        try:
-            print(f"\nAnalyzing image: {image_url}")
-            async with aiohttp.ClientSession() as session:
-                async with session.post(url, json=data, headers=headers) as response:
-                    if response.status != 200:
-                        error_text = await response.text()
-                        print(f"API Error ({response.status}): {error_text}")
-                        return None
-                    
-                    try:
-                        result = await response.json()
-                        print(f"API Response: {json.dumps(result, indent=2)}")
-                    except json.JSONDecodeError as e:
-                        print(f"Error decoding JSON response: {e}")
-                        response_text = await response.text()
-                        print(f"Raw response: {response_text}")
-                        return None
-                    
-                    if not result.get('choices'):
-                        print(f"Warning: No 'choices' in API response")
-                        return None
-                    
-                    if not result['choices']:
-                        print(f"Warning: Empty 'choices' array in API response")
-                        return None
-                    
-                    if not result['choices'][0].get('message'):
-                        print(f"Warning: No 'message' in first choice")
-                        return None
-                    
-                    if not result['choices'][0]['message'].get('content'):
-                        print(f"Warning: No 'content' in message")
-                        return None
-                    
-                    content = result['choices'][0]['message']['content']
-                    print(f"Content from API: {content}")
+    async def _request_completion(self, data: Dict) -> Optional[str]:
+        """POST a chat completion request and return the stripped reply text.
+        
+        Rate limits (429), transient 5xx responses and transport errors
+        (RETRYABLE_ERRORS) are retried up to MAX_API_ATTEMPTS times with
+        exponential backoff and jitter, honouring Retry-After when the server
+        sends it. Returns None on any other non-200 status, once status
+        retries are exhausted, or on a malformed body; a transport error on
+        the last attempt is raised to the caller.
+        """
+        session = self._get_session()
+        # Serialize once to bytes; json= would re-encode with the stdlib json module
+        body = _json_dumps(data)
+        raw_body = None
+        for attempt in range(MAX_API_ATTEMPTS):
+            try:
+                async with self._get_semaphore('api', self.max_concurrency), session.post(self._chat_url, data=body, headers=self._api_headers) as response:
+                    if response.status == 200:
+                        # Read the body once; on a parse failure the same bytes are logged
+                        raw_body = await response.read()
+                        break
                     
-                    if content.lower() == "null":
-                        print("Content is 'null', skipping image")
+                    error_text = await response.text()
+                    logger.warning("API Error (%s): %s", response.status, error_text)
+                    if response.status not in RETRYABLE_STATUSES or attempt == MAX_API_ATTEMPTS - 1:
                         return None
-                    
-                    # Extract confidence score using the new method
-                    confidence = self.extract_confidence_score(content)
-                    print(f"Extracted confidence score: {confidence}")
-                    
-                    # Extract description using the new method
-                    description = self.extract_description(content)
-                    print(f"Extracted description: {description}")
-                    
-                    # Get additional detection scores
-                    detection_scores = {}
-                    if html_element and page_html:
-                        image_data = base64.b64decode(image_base64)
-                        domain = urlparse(page_url).netloc
-                        
-                        detection_scores['html_context'] = await self.detection_strategies.analyze_html_context(html_element, page_url)
-                        detection_scores['structural_position'] = await self.detection_strategies.analyze_structural_position(html_element, [])
-                        detection_scores['technical'] = await self.detection_strategies.analyze_image_technical(image_url, image_data)
-                        detection_scores['visual'] = await self.detection_strategies.analyze_visual_characteristics(image_data)
-                        detection_scores['url_semantics'] = await self.detection_strategies.analyze_url_semantics(image_url)
-                        detection_scores['metadata'] = await self.detection_strategies.analyze_metadata(image_data)
-                        detection_scores['social_media'] = await self.detection_strategies.analyze_social_media(domain)
-                        detection_scores['schema_markup'] = await self.detection_strategies.analyze_schema_markup(page_html)
-                        
-                        # Calculate rank score
-                        rank_score = await self.detection_strategies.get_final_score(detection_scores)
-                    else:
-                        rank_score = confidence
-                    
-                    return LogoResult(
-                        url=image_url,
-                        confidence=confidence,
-                        description=description,
-                        page_url=page_url,
-                        image_hash=self.get_image_hash(image_base64.encode()),
-                        timestamp=datetime.now(),
-                        rank_score=rank_score,
-                        detection_scores=detection_scores
-                    )
+                    delay = self._retry_delay(attempt, response.headers.get('Retry-After'))
+            except RETRYABLE_ERRORS as e:
+                if attempt == MAX_API_ATTEMPTS - 1:
+                    raise
+                logger.warning("Transient error calling the API (%r), retrying", e)
+                delay = self._retry_delay(attempt)
             
-        except aiohttp.ClientError as e:
-            print(f"HTTP Error analyzing image {image_url}: {e}")
+            # Back off outside the semaphore so waiting requests don't hold a slot
+            await asyncio.sleep(delay)
+        
+        if raw_body is None:
             return None
-        except Exception as e:
-            print(f"Error analyzing image {image_url}: {e}")
-            print(f"Error type: {type(e)}")
-            import traceback
-            traceback.print_exc()
+        
+        try:
+            result = _json_loads(raw_body)
+            logger.debug("API Response: %s", result)
+        except json.JSONDecodeError as e:
+            logger.warning("Error decoding JSON response: %s; raw response: %r", e, raw_body[:512])
             return None
-
-    async def _analyze_image_with_regular_openai(self, image_base64: str, image_url: str, page_url: str, html_element: Optional[Tag] = None, page_html: Optional[str] = None) -> Optional[LogoResult]:
-        """Analyze an image using regular OpenAI API and additional detection strategies."""
-        url = "https://api.openai.com/v1/chat/completions"
         
-        messages = [
-            {"role": "system", "content": "You are a logo detection assistant. Analyze the image and determine if it's a logo. If it is, provide a confidence score (0-1) and description in this format: 'Confidence Score: X.XX\nDescription: ...'. If not, return 'null'."},
-            {
-                "role": "user",
-                "content": [
-                    {
-                        "type": "text",
-                        "text": "Is this image a logo? If yes, provide a confidence score (0-1) and a brief description of what makes it a logo. Format your response as 'Confidence Score: X.XX\nDescription: ...'. If no, return null."
-                    },
-                    {
-                        "type": "image_url",
-                        "image_url": {
-                            "url": f"data:image/png;base64,{image_base64}"
-                        }
-                    }
-                ]
-            }
-        ]
+        if not result.get('choices'):
+            logger.warning("No 'choices' in API response")
+            return None
+        
+        if not result['choices']:
+            logger.warning("Empty 'choices' array in API response")
+            return None
+        
+        if not result['choices'][0].get('message'):
+            logger.warning("No 'message' in first choice")
+            return None
+        
+        if not result['choices'][0]['message'].get('content'):
+            logger.warning("No 'content' in message")
+            return None
+        
+        return result['choices'][0]['message']['content'].strip()
 
+    async def analyze_images_batch(self, items: List[Tuple[bytes, str, str]], image_hashes: Optional[List[str]] = None) -> Optional[List[Optional[LogoResult]]]:
+        """Analyze several images with a single chat completion request.
+        
+        Sharing one request amortizes the round trip and the system prompt
+        tokens across all images in the batch.
+        
+        Args:
+            items: (image_data, image_url, page_url) tuples of PNG, JPEG, GIF or WebP bytes and URLs
+            image_hashes: Hashes of the raw image bytes, in the same order as items
+            
+        Returns:
+            One entry per item (None for images that aren't logos), or None if the
+            request failed or the reply couldn't be parsed, so callers can fall
+            back to analyze_image_with_openai for each image.
+        """
+        if not items:
+            return []
+        if image_hashes is None:
+            image_hashes = [self.get_image_hash(image_data) for image_data, _, _ in items]
+        
+        content: List[Dict] = [{"type": "text", "text": f"There are {len(items)} images, indexed 0 to {len(items) - 1}."}]
+        for index, (image_data, _, _) in enumerate(items):
+            content.append({"type": "text", "text": f"Image {index}:"})
+            content.append(self._image_url_part(image_data))
+        
         data = {
-            "model": "gpt-4o-mini",
-            "messages": messages,
-            "max_tokens": 300
+            "messages": [LOGO_BATCH_SYSTEM_MESSAGE, {"role": "user", "content": content}],
+            "max_tokens": 150 * len(items) + 50,
+            "response_format": {"type": "json_object"},
+            **self._api_extra_body
         }
-
-        headers = {
-            'Content-Type': 'application/json',
-            'Authorization': f'Bearer {self.api_key}'
+        
+        try:
+            logger.debug("Analyzing %d images in one request", len(items))
+            reply = await self._request_completion(data)
+        except aiohttp.ClientError as e:
+            logger.warning("HTTP Error analyzing image batch: %s", e)
+            return None
+        if reply is None:
+            return None
+        
+        try:
+            entries = _json_loads(reply).get("results")
+        except (json.JSONDecodeError, AttributeError):
+            entries = None
+        if not isinstance(entries, list):
+            logger.warning("Unexpected batch reply: %s", reply[:200])
+            return None
+        
+        by_index = {
+            entry["index"]: entry
+            for entry in entries
+            if isinstance(entry, dict) and isinstance(entry.get("index"), int)
         }
+        
+        results: List[Optional[LogoResult]] = []
+        for index, ((_, image_url, page_url), image_hash) in enumerate(zip(items, image_hashes)):
+            entry = by_index.get(index)
+            analysis = self._analysis_from_dict(entry) if entry else None
+            if analysis is None:
+                if entry:
+                    # The model answered for this image: it isn't a logo
+                    self.image_cache.mark_negative(image_hash)
+                results.append(None)
+                continue
+            
+            confidence, description = analysis
+            results.append(LogoResult.model_construct(
+                url=image_url,
+                confidence=confidence,
+                description=description,
+                page_url=page_url,
+                image_hash=image_hash,
+                timestamp=datetime.now(),
+                rank_score=confidence
+            ))
+        
+        return results
 
+    async def analyze_image_with_openai(self, image_data: bytes, image_url: str, page_url: str, image_hash: Optional[str] = None) -> Optional[LogoResult]:
+        """Analyze PNG, JPEG, GIF or WebP image bytes using OpenAI API (regular or Azure).
+        
+        Pass image_hash when the caller has already hashed the image bytes.
+        """
+        if image_hash is None:
+            image_hash = self.get_image_hash(image_data)
+        data = {
+            "messages": self._build_messages(image_data),
+            "max_tokens": 300,
+            "response_format": {"type": "json_object"},
+            **self._api_extra_body
+        }
+        
         try:
-            print(f"\nAnalyzing image: {image_url}")
-            async with aiohttp.ClientSession() as session:
-                async with session.post(url, json=data, headers=headers) as response:
-                    if response.status != 200:
-                        error_text = await response.text()
-                        print(f"API Error ({response.status}): {error_text}")
-                        return None
-                    
-                    try:
-                        result = await response.json()
-                        print(f"API Response: {json.dumps(result, indent=2)}")
-                    except json.JSONDecodeError as e:
-                        print(f"Error decoding JSON response: {e}")
-                        response_text = await response.text()
-                        print(f"Raw response: {response_text}")
-                        return None
-                    
-                    if not result.get('choices'):
-                        print(f"Warning: No 'choices' in API response")
-                        return None
-                    
-                    if not result['choices']:
-                        print(f"Warning: Empty 'choices' array in API response")
-                        return None
-                    
-                    if not result['choices'][0].get('message'):
-                        print(f"Warning: No 'message' in first choice")
-                        return None
-                    
-                    if not result['choices'][0]['message'].get('content'):
-                        print(f"Warning: No 'content' in message")
-                        return None
-                    
-                    content = result['choices'][0]['message']['content']
-                    print(f"Content from API: {content}")
-                    
-                    if content.lower() == "null":
-                        print("Content is 'null', skipping image")
-                        return None
-                    
-                    # Extract confidence score using the new method
-                    confidence = self.extract_confidence_score(content)
-                    print(f"Extracted confidence score: {confidence}")
-                    
-                    # Extract description using the new method
-                    description = self.extract_description(content)
-                    print(f"Extracted description: {description}")
-                    
-                    # Get additional detection scores
-                    detection_scores = {}
-                    if html_element and page_html:
-                        image_data = base64.b64decode(image_base64)
-                        domain = urlparse(page_url).netloc
-                        
-                        detection_scores['html_context'] = await self.detection_strategies.analyze_html_context(html_element, page_url)
-                        detection_scores['structural_position'] = await self.detection_strategies.analyze_structural_position(html_element, [])
-                        detection_scores['technical'] = await self.detection_strategies.analyze_image_technical(image_url, image_data)
-                        detection_scores['visual'] = await self.detection_strategies.analyze_visual_characteristics(image_data)
-                        detection_scores['url_semantics'] = await self.detection_strategies.analyze_url_semantics(image_url)
-                        detection_scores['metadata'] = await self.detection_strategies.analyze_metadata(image_data)
-                        detection_scores['social_media'] = await self.detection_strategies.analyze_social_media(domain)
-                        detection_scores['schema_markup'] = await self.detection_strategies.analyze_schema_markup(page_html)
-                        
-                        # Calculate rank score
-                        rank_score = await self.detection_strategies.get_final_score(detection_scores)
-                    else:
-                        rank_score = confidence
-                    
-                    return LogoResult(
-                        url=image_url,
-                        confidence=confidence,
-                        description=description,
-                        page_url=page_url,
-                        image_hash=self.get_image_hash(image_base64.encode()),
-                        timestamp=datetime.now(),
-                        rank_score=rank_score,
-                        detection_scores=detection_scores
-                    )
+            logger.debug("Analyzing image: %s", image_url)
+            content = await self._request_completion(data)
+            if content is None:
+                return None
+            logger.debug("Content from API: %s", content)
+            
+            analysis = self.parse_logo_analysis(content)
+            if analysis is None:
+                logger.debug("Image is not a logo, skipping: %s", image_url)
+                self.image_cache.mark_negative(image_hash)
+                return None
             
+            confidence, description = analysis
+            logger.debug("Extracted confidence score %s and description %r for %s", confidence, description, image_url)
+            
+            return LogoResult.model_construct(
+                url=image_url,
+                confidence=confidence,
+                description=description,
+                page_url=page_url,
+                image_hash=image_hash,
+                timestamp=datetime.now(),
+                rank_score=confidence
+            )
+    
         except aiohttp.ClientError as e:
-            print(f"HTTP Error analyzing image {image_url}: {e}")
+            logger.warning("HTTP Error analyzing image %s: %s", image_url, e)
             return None
-        except Exception as e:
-            print(f"Error analyzing image {image_url}: {e}")
-            print(f"Error type: {type(e)}")
-            import traceback
-            traceback.print_exc()
+        except Exception:
+            logger.exception("Error analyzing image %s", image_url)
+            return None
+        
+    def _remember_url_hash(self, image_url: str, image_hash: str):
+        """Record the content hash of image_url, evicting the least recently used mapping."""
+        self._url_hashes[image_url] = image_hash
+        self._url_hashes.move_to_end(image_url)
+        if len(self._url_hashes) > URL_HASH_CACHE_SIZE:
+            self._url_hashes.popitem(last=False)
+
+    def _is_known_non_logo_url(self, image_url: str) -> bool:
+        """Check whether image_url was downloaded before and found not to be a logo."""
+        known_hash = self._url_hashes.get(image_url)
+        return known_hash is not None and self.image_cache.is_negative(known_hash)
+
+    def _cached_result_for_url(self, image_url: str, page_url: str) -> Optional[LogoResult]:
+        """Return a copy of the cached analysis for a previously downloaded URL, if any."""
+        known_hash = self._url_hashes.get(image_url)
+        if known_hash is None:
             return None
+        self._url_hashes.move_to_end(image_url)
+        cached_result = self.image_cache.get(known_hash)
+        if cached_result:
+            return cached_result.model_copy(update={"url": image_url, "page_url": page_url})
+        return None
+
+    async def _download_image(self, image_url: str, max_bytes: Optional[int] = None) -> Optional[bytes]:
+        """Download image bytes with the shared session.
+        
+        Returns None on a non-200 status, or when the response headers show an
+        HTML/JSON Content-Type or a Content-Length above max_bytes; in those
+        cases the body is never read. Bodies without a Content-Length are
+        streamed and abandoned as soon as they exceed max_bytes. Bodies not
+        labelled image/* (binary/octet-stream, SVG served as text/xml or
+        text/plain, ...) are kept only if their leading bytes look like an image.
         
+        Args:
+            image_url: The image to download.
+            max_bytes: Size limit for the body (default: max_image_bytes).
+        """
+        if max_bytes is None:
+            max_bytes = self.max_image_bytes
+        session = self._get_session()
+        async with session.get(image_url, headers=IMAGE_REQUEST_HEADERS) as response:
+            if response.status != 200:
+                return None
+            if not self._is_acceptable_image_response(response, max_bytes):
+                logger.debug("Skipping image %s (Content-Type %r, Content-Length %s)",
+                             image_url, response.content_type, response.content_length)
+                return None
+            
+            buffer = bytearray()
+            async for chunk in response.content.iter_chunked(IMAGE_READ_CHUNK_SIZE):
+                buffer.extend(chunk)
+                if len(buffer) > max_bytes:
+                    logger.debug("Skipping image %s (body exceeds %d bytes)", image_url, max_bytes)
+                    return None
+            
+            image_data = bytes(buffer)
+            if not response.content_type.startswith('image/') and not _looks_like_image(image_data):
+                logger.debug("Skipping image %s (Content-Type %r, body is not an image)",
+                             image_url, response.content_type)
+                return None
+            return image_data
+
+    def _is_acceptable_image_response(self, response: aiohttp.ClientResponse, max_bytes: int) -> bool:
+        """Check an image response's headers before its body is downloaded."""
+        if response.content_length is not None and response.content_length > max_bytes:
+            return False
+        # Other types are read and sniffed, since servers often mislabel images
+        return response.content_type not in NON_IMAGE_CONTENT_TYPES
+
+
     async def analyze_image(self, image_url: str, page_url: str) -> Optional[LogoResult]:
         """Analyze an image using gpt-4o-mini to determine if it's a logo."""
         try:
-            async with aiohttp.ClientSession() as session:
-                async with session.get(image_url, headers=BROWSER_HEADERS) as response:
-                    if response.status != 200:
-                        return None
+            # A URL seen before whose analysis is still cached needs no download
+            cached_result = self._cached_result_for_url(image_url, page_url)
+            if cached_result:
+                return cached_result
+            if self._is_known_non_logo_url(image_url):
+                return None
+            
+            image_data = await self._download_image(image_url)
+            if image_data is None:
+                return None
+            
+            image_hash = self.get_image_hash(image_data)
+            self._remember_url_hash(image_url, image_hash)
+            
+            # Check cache first
+            cached_result = self.image_cache.get(image_hash)
+            if cached_result:
+                # Same bytes may be served from another URL or page; return
+                # a copy so callers can mark it (e.g. is_header) independently
+                return cached_result.model_copy(update={"url": image_url, "page_url": page_url})
+            if self.image_cache.is_negative(image_hash):
+                return None
+            
+            # If another task is already analyzing these bytes, wait for its result
+            # instead of sending a duplicate API request
+            pending = self._inflight.get(image_hash)
+            if pending is not None:
+                result = await asyncio.shield(pending)
+                return result.model_copy(update={"url": image_url, "page_url": page_url}) if result else None
+            
+            future = asyncio.get_running_loop().create_future()
+            self._inflight[image_hash] = future
+            result = None
+            try:
+                result = await self._analyze_image_data(image_data, image_hash, image_url, page_url)
+            finally:
+                del self._inflight[image_hash]
+                future.set_result(result)
+            return result
+                        
+        except Exception as e:
+            logger.warning("Error analyzing image %s: %s", image_url, e)
+            return None
+
+    async def _analyze_images(self, image_urls: List[str], page_url: str) -> List[Optional[LogoResult]]:
+        """Analyze image_urls, returning one entry per URL in order.
+        
+        Images are downloaded and prepared concurrently (bounded by the image
+        semaphore), then the ones not already cached or being analyzed are
+        sent ANALYSIS_BATCH_SIZE at a time through analyze_images_batch. A
+        batch that fails falls back to one request per image. Failed
+        analyses come back as None rather than raising.
+        """
+        # Every result from this page shares one page_url string, including
+        # across calls that pass equal but distinct strings for the same page
+        page_url = sys.intern(page_url)
+        results: List[Optional[LogoResult]] = [None] * len(image_urls)
+        # Hashes this call analyzes, mapped to every index that shares the bytes
+        claimed: Dict[str, List[int]] = {}
+        owned: Dict[str, "asyncio.Future[Optional[LogoResult]]"] = {}
+        prepared: List[Tuple[str, bytes]] = []
+        # Images another call is already analyzing; awaited once our own batches
+        # are sent, so two pages waiting on each other's images can't deadlock
+        waiting: List[Tuple[int, "asyncio.Future[Optional[LogoResult]]"]] = []
+        loop = asyncio.get_running_loop()
+        
+        def resolve(image_hash: str, result: Optional[LogoResult]):
+            future = owned[image_hash]
+            if self._inflight.get(image_hash) is future:
+                del self._inflight[image_hash]
+            if not future.done():
+                future.set_result(result)
+        
+        async def prepare(index: int, image_url: str):
+            async with self._get_semaphore('image', self.max_image_concurrency):
+                try:
+                    cached_result = self._cached_result_for_url(image_url, page_url)
+                    if cached_result:
+                        results[index] = cached_result
+                        return
+                    if self._is_known_non_logo_url(image_url):
+                        return
                     
-                    image_data = await response.read()
+                    image_data = await self._download_image(image_url)
+                    if image_data is None:
+                        return
                     image_hash = self.get_image_hash(image_data)
+                    self._remember_url_hash(image_url, image_hash)
                     
-                    # Check cache first
                     cached_result = self.image_cache.get(image_hash)
                     if cached_result:
-                        return cached_result
+                        results[index] = cached_result.model_copy(update={"url": image_url, "page_url": page_url})
+                        return
+                    if self.image_cache.is_negative(image_hash):
+                        return
+                    if image_hash in claimed:
+                        claimed[image_hash].append(index)
+                        return
+                    pending = self._inflight.get(image_hash)
+                    if pending is not None:
+                        waiting.append((index, pending))
+                        return
                     
-                    # Handle SVG files
-                    if image_url.lower().endswith('.svg'):
-                        try:
-                            # Convert SVG to PNG using cairosvg
-                            png_data = cairosvg.svg2png(bytestring=image_data)
-                            image = Image.open(io.BytesIO(png_data))
-                        except Exception as e:
-                            print(f"Error converting SVG {image_url}: {e}")
-                            return None
+                    owned[image_hash] = self._inflight[image_hash] = loop.create_future()
+                    claimed[image_hash] = [index]
+                    payload = await asyncio.to_thread(self._prepare_image_payload, image_data, image_url)
+                    if payload is None:
+                        self.image_cache.mark_negative(image_hash)
+                        resolve(image_hash, None)
                     else:
-                        image = Image.open(io.BytesIO(image_data))
-                    
-                    # Skip if image is too small
-                    if not self.is_valid_image_size(image):
-                        return None
-                    
-                    # Remove background by default
-                    image = self.remove_background(image)
-                    
-                    buffered = io.BytesIO()
-                    image.save(buffered, format="PNG")
-                    image_base64 = base64.b64encode(buffered.getvalue()).decode('utf-8')
-                    
-                    # Analyze with OpenAI (Azure or regular)
-                    result = await self.analyze_image_with_openai(image_base64, image_url, page_url)
-                    
-                    if result:
-                        # Cache the result
-                        self.image_cache.set(image_hash, result)
-                    
-                    return result
-                        
-        except Exception as e:
-            print(f"Error analyzing image {image_url}: {e}")
+                        prepared.append((image_hash, payload))
+                except Exception as e:
+                    logger.warning("Error analyzing image %s: %s", image_url, e)
+        
+        async def analyze_batch(batch: List[Tuple[str, bytes]]):
+            image_hashes = [image_hash for image_hash, _ in batch]
+            items = [(payload, image_urls[claimed[image_hash][0]], page_url) for image_hash, payload in batch]
+            batch_results = None
+            if len(batch) > 1:
+                try:
+                    batch_results = await self.analyze_images_batch(items, image_hashes)
+                except Exception as e:
+                    logger.warning("Error analyzing image batch: %s", e)
+            if batch_results is None:
+                batch_results = await asyncio.gather(
+                    *(self.analyze_image_with_openai(payload, image_url, page_url, image_hash=image_hash)
+                      for (payload, image_url, _), image_hash in zip(items, image_hashes)),
+                    return_exceptions=True,
+                )
+            
+            for image_hash, result in zip(image_hashes, batch_results):
+                result = result if isinstance(result, LogoResult) else None
+                if result:
+                    self.image_cache.set(image_hash, result)
+                resolve(image_hash, result)
+                first, *duplicates = claimed[image_hash]
+                results[first] = result
+                for index in duplicates:
+                    results[index] = result.model_copy(update={"url": image_urls[index]}) if result else None
+        
+        try:
+            await asyncio.gather(*(prepare(index, image_url) for index, image_url in enumerate(image_urls)))
+            await asyncio.gather(
+                *(analyze_batch(prepared[start:start + ANALYSIS_BATCH_SIZE])
+                  for start in range(0, len(prepared), ANALYSIS_BATCH_SIZE)),
+                return_exceptions=True,
+            )
+            for index, pending in waiting:
+                result = await asyncio.shield(pending)
+                if result:
+                    results[index] = result.model_copy(update={"url": image_urls[index], "page_url": page_url})
+        finally:
+            # Never leave other callers waiting on an analysis that didn't finish
+            for image_hash in owned:
+                resolve(image_hash, None)
+        
+        return results
+
+    def _prepare_image_payload(self, image_data: bytes, image_url: str) -> Optional[bytes]:
+        """Turn downloaded image bytes into the payload sent to the API.
+        
+        Images already in a format the API accepts are sent as downloaded
+        unless background removal needs to rewrite the pixels; only then
+        (or for formats like ICO/BMP) is the image re-encoded as PNG.
+        
+        Returns None only for verdicts about the image itself (too small or
+        photo-like), which callers remember as non-logos. Failures to render
+        or decode raise instead, since they may come from the environment
+        (missing libcairo, a broken process pool) and shouldn't be cached.
+        
+        SVG rendering, decoding and PNG encoding are CPU-bound, so callers run
+        this in a worker thread (asyncio.to_thread) to keep the event loop free.
+        """
+        # Handle SVG files
+        if SVG_URL_PATTERN.search(image_url):
+            # Convert SVG to PNG using cairosvg
+            png_data = self._run_cpu(_render_svg, image_data)
+            image = Image.open(io.BytesIO(png_data))
+            payload = image_data = png_data
+        else:
+            # Reject tiny images (icons, tracking pixels) from their header bytes alone
+            size = _probe_image_size(image_data)
+            if size is not None and (size[0] < self.min_width or size[1] < self.min_height):
+                return None
+            
+            # Image.open only parses the header here; pixels are decoded on demand
+            image = Image.open(io.BytesIO(image_data))
+            payload = image_data if image.format in API_IMAGE_FORMATS else None
+        
+        # Skip if image is too small
+        if not self.is_valid_image_size(image):
+            return None
+        
+        # Skip photos, which would only spend an API call to be rejected
+        if self.skip_photos and self.looks_like_photo(image):
+            logger.debug("Skipping photo-like image %s", image_url)
             return None
+        
+        # Remove background by default; rembg takes the encoded bytes and returns
+        # a PNG, which is sent as-is without decoding and re-encoding it here
+        if REMBG_AVAILABLE:
+            removed = self.remove_background_bytes(image_data)
+            if removed is not None:
+                return removed
+        
+        if payload is None:
+            buffered = io.BytesIO()
+            image.save(buffered, format="PNG")
+            payload = buffered.getvalue()
+        
+        return payload
+
+    async def _analyze_image_data(self, image_data: bytes, image_hash: str, image_url: str, page_url: str) -> Optional[LogoResult]:
+        """Prepare downloaded image bytes and analyze them with OpenAI."""
+        payload = await asyncio.to_thread(self._prepare_image_payload, image_data, image_url)
+        if payload is None:
+            self.image_cache.mark_negative(image_hash)
+            return None
+        
+        # Analyze with OpenAI (Azure or regular)
+        result = await self.analyze_image_with_openai(payload, image_url, page_url, image_hash=image_hash)
+        
+        if result:
+            # Cache the result
+            self.image_cache.set(image_hash, result)
+        
+        return result
     
     def extract_background_images(self, soup: BeautifulSoup) -> List[str]:
         """Extract background images from CSS."""
@@ -691,13 +1550,13 @@ class LogoCrawler:
         # Look for style attributes
         for element in soup.find_all(style=True):
             style = element['style']
-            matches = re.findall(r"background-image:\s*url\((.*?)\)", style)
+            matches = BACKGROUND_IMAGE_URL_PATTERN.findall(style)
             background_images.extend(matches)
             
         # Look for background-image in style tags
         for style_tag in soup.find_all('style'):
             if style_tag.string:
-                matches = re.findall(r"background-image:\s*url\((.*?)\)", style_tag.string)
+                matches = BACKGROUND_IMAGE_URL_PATTERN.findall(style_tag.string)
                 background_images.extend(matches)
                 
         return background_images
@@ -708,74 +1567,76 @@ class LogoCrawler:
         processed_images = set()
         processed_urls = set()
         
+        queue: "asyncio.Queue[str]" = asyncio.Queue()
+        base_domain = urlparse(start_url).netloc
+        
         async def process_page(url: str):
             try:
-                async with aiohttp.ClientSession() as session:
-                    async with session.get(url, headers=BROWSER_HEADERS) as response:
-                        if response.status != 200:
-                            return
-                        
-                        content = await response.text()
-                        
-                        # Parse HTML
-                        soup = BeautifulSoup(content, 'html.parser')
-                        
-                        # Find all images
-                        images = soup.find_all('img')
-                        
-                        # Get background images
-                        background_images = self.extract_background_images(soup)
-                        
-                        # Combine all image URLs
-                        all_image_urls = []
-                        
-                        # Add img tag sources
-                        for img in images:
-                            img_url = img.get('src')
-                            if img_url:
-                                all_image_urls.append(urljoin(url, img_url))
-                        
-                        # Add background images
-                        for bg_url in background_images:
-                            all_image_urls.append(urljoin(url, bg_url))
+                session = self._get_session()
+                async with session.get(url, headers=BROWSER_HEADERS) as response:
+                    if response.status != 200:
+                        return
                         
-                        # Analyze each image
-                        for img_url in all_image_urls:
-                            if img_url in processed_images:
-                                continue
-                                
-                            processed_images.add(img_url)
-                            
-                            # Skip non-image URLs
-                            if not any(img_url.lower().endswith(ext) for ext in ['.jpg', '.jpeg', '.png', '.gif', '.svg']):
-                                continue
-                            
-                            # Analyze image
-                            result = await self.analyze_image(img_url, url)
-                            if result:
-                                logo_results.append(result)
+                    content = await response.text()
                         
-                        # Find all links for further crawling
-                        links = soup.find_all('a')
-                        base_domain = urlparse(start_url).netloc
+                # Parse HTML
+                soup = BeautifulSoup(content, HTML_PARSER)
+                
+                # One walk over links and images. Links are queued as they're found,
+                # so idle workers can fetch them while this page's images are analyzed
+                all_image_urls = []
+                for element in soup.find_all(['a', 'img']):
+                    if element.name == 'img':
+                        img_url = element.get('src')
+                        if img_url:
+                            all_image_urls.append(urljoin(url, img_url))
+                        continue
+                    
+                    # Claim pages synchronously (no await between check and add),
+                    # so concurrent workers never exceed max_pages
+                    href = element.get('href')
+                    if href:
+                        absolute_url = urljoin(url, href)
+                        if (
+                            urlparse(absolute_url).netloc == base_domain
+                            and absolute_url not in processed_urls
+                            and len(processed_urls) < max_pages
+                        ):
+                            processed_urls.add(absolute_url)
+                            queue.put_nowait(absolute_url)
+                    
+                # Get background images
+                background_images = self.extract_background_images(soup)
+                    
+                # Add background images
+                for bg_url in background_images:
+                    all_image_urls.append(urljoin(url, bg_url))
+                    
+                # Collect images not yet seen on any page
+                new_image_urls = []
+                for img_url in all_image_urls:
+                    if img_url in processed_images:
+                        continue
                         
-                        for link in links:
-                            href = link.get('href')
-                            if href:
-                                absolute_url = urljoin(url, href)
-                                if (
-                                    urlparse(absolute_url).netloc == base_domain
-                                    and absolute_url not in processed_urls
-                                    and len(processed_urls) < max_pages
-                                ):
-                                    processed_urls.add(absolute_url)
-                                    await process_page(absolute_url)
+                    processed_images.add(img_url)
+                    
+                    # Skip non-image URLs
+                    if not IMAGE_URL_PATTERN.search(img_url):
+                        continue
+                    
+                    new_image_urls.append(img_url)
                 
+                # Analyze the page's images concurrently
+                for result in await self._analyze_images(new_image_urls, url):
+                    if result:
+                        logo_results.append(result)
+
             except Exception as e:
-                print(f"Error processing page {url}: {e}")
+                logger.warning("Error processing page %s: %s", url, e)
         
         # Start crawling from the initial URL
         processed_urls.add(start_url)
+        queue.put_nowait(start_url)
         with Progress(
             SpinnerColumn(),
             TextColumn("[progress.description]{task.description}"),
@@ -783,163 +1644,183 @@ class LogoCrawler:
             TaskProgressColumn(),
         ) as progress:
             task = progress.add_task("Crawling pages...", total=max_pages)
-            await process_page(start_url)
-            progress.update(task, completed=len(processed_urls))
-        
+            
+            # Breadth-first crawl: workers pull pages off the queue until it drains
+            async def worker():
+                while True:
+                    url = await queue.get()
+                    try:
+                        await process_page(url)
+                        progress.advance(task)
+                    finally:
+                        queue.task_done()
+            
+            # More workers than pages would only sit idle on the queue
+            worker_count = max(1, min(self.max_page_concurrency, max_pages))
+            workers = [asyncio.create_task(worker()) for _ in range(worker_count)]
+            try:
+                await queue.join()
+            finally:
+                for worker_task in workers:
+                    worker_task.cancel()
+                await asyncio.gather(*workers, return_exceptions=True)
+
         # Sort results by confidence
         logo_results.sort(key=lambda x: x.confidence, reverse=True)
         
         # Save results to file if output_file is specified
         if output_file:
             try:
-                print(f"\nPreparing to save results...")
-                print(f"Output file path: {output_file}")
-                
-                # Convert results to dict format
-                results_dict = []
-                for result in logo_results:
-                    result_dict = {
-                        "url": result.url,
-                        "confidence": result.confidence,
-                        "description": result.description,
-                        "page_url": result.page_url,
-                        "image_hash": result.image_hash,
-                        "timestamp": result.timestamp.isoformat(),
-                        "rank_score": result.rank_score,
-                        "detection_scores": result.detection_scores
-                    }
-                    results_dict.append(result_dict)
-                
-                print(f"Converted {len(results_dict)} results to JSON format")
+                # Timestamps stay datetimes; _json_dumps writes them as ISO strings
+                results_dict = [
+                    result.model_dump(exclude={"is_header"})
+                    for result in logo_results
+                ]
                 
                 # Create output directory if needed
                 output_path = Path(output_file)
                 if output_path.parent != Path('.'):
-                    print(f"Creating directory: {output_path.parent}")
                     output_path.parent.mkdir(parents=True, exist_ok=True)
                 
                 # Save to file
-                print(f"Writing results to file: {output_path}")
-                json_data = json.dumps(results_dict, indent=2)
-                print(f"JSON data length: {len(json_data)} bytes")
-                
-                with open(output_path, 'w') as f:
-                    f.write(json_data)
+                logger.info("Writing %d results to file: %s", len(results_dict), output_path)
+                with open(output_path, 'wb') as f:
+                    f.write(_json_dumps(results_dict, indent=True))
                     f.flush()
                     os.fsync(f.fileno())  # Ensure data is written to disk
                 
-                # Verify file was written
-                if output_path.exists():
-                    print(f"File exists after writing: {output_path}")
-                    print(f"File size: {output_path.stat().st_size} bytes")
-                else:
-                    print(f"Warning: File does not exist after writing: {output_path}")
-                
-            except Exception as e:
-                print(f"Error saving results to file: {e}")
-                import traceback
-                traceback.print_exc()
+            except Exception:
+                logger.exception("Error saving results to file %s", output_file)
         
         return logo_results 
 
+    def _collect_page_images(self, soup: BeautifulSoup, base_url: str) -> Dict[str, bool]:
+        """Map every <img> and <svg><image> URL on the page to whether it sits in a header/nav.
+        
+        Header roots are looked up with one select() over the precompiled
+        selector, then a single walk over the image elements checks each
+        one's ancestors against them.
+        """
+        header_roots: Set[int] = {id(element) for element in HEADER_SELECTOR.select(soup)}
+        
+        images: Dict[str, bool] = {}
+        for element in soup.find_all(['img', 'image']):
+            in_svg = False
+            is_header = False
+            for parent in element.parents:
+                if parent.name == 'svg':
+                    in_svg = True
+                if id(parent) in header_roots:
+                    is_header = True
+            
+            if element.name == 'img':
+                src = element.get('src')
+            elif in_svg:
+                src = element.get('href') or element.get('xlink:href')
+            else:
+                continue
+            if not src:
+                continue
+            
+            full_url = urljoin(base_url, src)
+            # The same URL can appear in the header and the body; the header wins
+            images[full_url] = images.get(full_url, False) or is_header
+        return images
+
     async def analyze_header_nav_elements(self, soup: BeautifulSoup, base_url: str) -> List[str]:
         """Extract image URLs from header and navigation elements."""
-        header_selectors = [
-            'header', 
-            'nav',
-            '[role="banner"]',
-            '.header',
-            '.nav',
-            '#header',
-            '#nav',
-            '.navbar',
-            '.site-header',
-            '.main-header'
+        return [
+            image_url
+            for image_url, is_header in self._collect_page_images(soup, base_url).items()
+            if is_header
         ]
+
+    def parse_rank_scores(self, content: str) -> Dict[int, float]:
+        """Parse a rank_logos reply into {logo index: score}.
         
-        header_images = set()
-        for selector in header_selectors:
-            elements = soup.select(selector)
-            for element in elements:
-                # Find all images in this header/nav element
-                for img in element.find_all('img'):
-                    src = img.get('src')
-                    if src:
-                        full_url = urljoin(base_url, src)
-                        header_images.add(full_url)
-                        
-                # Find all SVG elements
-                for svg in element.find_all('svg'):
-                    # If SVG has an image
-                    for image in svg.find_all('image'):
-                        href = image.get('href') or image.get('xlink:href')
-                        if href:
-                            full_url = urljoin(base_url, href)
-                            header_images.add(full_url)
+        Reads the JSON {"rankings": [...]} object the prompt asks for, and
+        falls back to scanning free text with RANK_SCORE_PATTERN (first
+        score per logo wins) if the reply isn't valid JSON.
+        """
+        try:
+            rankings = _json_loads(content)["rankings"]
+            return {
+                int(entry["index"]): float(entry["score"])
+                for entry in rankings
+                if isinstance(entry, dict) and "index" in entry and "score" in entry
+            }
+        except (json.JSONDecodeError, KeyError, TypeError, ValueError):
+            pass
         
-        return list(header_images)
+        scores: Dict[int, float] = {}
+        for match in RANK_SCORE_PATTERN.finditer(content):
+            scores.setdefault(int(match.group(1)), float(match.group(2)))
+        return scores
 
     async def rank_logos(self, logos: List[LogoResult]) -> List[LogoResult]:
         """Use gpt-4o-mini to rank logos based on confidence and description."""
         if not logos:
             return []
 
-        url = "https://scailetech.openai.azure.com/openai/deployments/gpt-4o-mini/chat/completions?api-version=2023-03-15-preview"
-        
         # Prepare the prompt with all logo information
         logo_descriptions = []
         for i, logo in enumerate(logos, 1):
             location = "header/navigation" if logo.is_header else "main content"
-            logo_descriptions.append(f"Logo {i}:\n- Location: {location}\n- Confidence: {logo.confidence}\n- Description: {logo.description}")
+            description = logo.description[:RANK_DESCRIPTION_MAX_CHARS]
+            logo_descriptions.append(f"Logo {i}:\n- Location: {location}\n- Confidence: {logo.confidence}\n- Description: {description}")
         
         messages = [
-            {
-                "role": "system",
-                "content": "You are a logo ranking assistant. Analyze the provided logos and rank them based on their likelihood of being the main company logo. Consider:\n1. Location (header/nav logos are more likely)\n2. Confidence score\n3. Description (looking for company name, branding elements)\n4. Professional design indicators"
-            },
+            RANK_SYSTEM_MESSAGE,
             {
                 "role": "user",
-                "content": f"Rank these logos from most to least likely to be the main company logo. For each logo, provide a score from 0-1 and brief explanation:\n\n{chr(10).join(logo_descriptions)}"
+                "content": f"Rank these logos from most to least likely to be the main company logo. Reply with JSON giving each logo's index and a score from 0-1:\n\n{chr(10).join(logo_descriptions)}"
             }
         ]
 
         data = {
             "messages": messages,
-            "max_tokens": 500
-        }
-
-        headers = {
-            'Content-Type': 'application/json',
-            'api-key': self.api_key
+            "max_tokens": 500,
+            "response_format": {"type": "json_object"},
+            **self._api_extra_body
         }
 
         try:
-            async with aiohttp.ClientSession() as session:
-                async with session.post(url, json=data, headers=headers) as response:
-                    if response.status != 200:
-                        print(f"Error ranking logos: {await response.text()}")
-                        return logos
-
-                    result = await response.json()
-                    content = result['choices'][0]['message']['content']
+            # Goes through the shared session and API semaphore like image analysis
+            content = await self._request_completion(data)
+            if content is None:
+                logger.error("Error ranking logos: no usable response from the API")
+                return logos
+            
+            scores = self.parse_rank_scores(content)
+            for i, logo in enumerate(logos, 1):
+                if i in scores:
+                    logo.rank_score = scores[i]
                     
-                    # Extract ranking scores using regex
-                    for i, logo in enumerate(logos, 1):
-                        pattern = rf"Logo {i}.*?score:?\s*(\d*\.?\d+)"
-                        match = re.search(pattern, content, re.IGNORECASE | re.DOTALL)
-                        if match:
-                            try:
-                                logo.rank_score = float(match.group(1))
-                            except ValueError:
-                                logo.rank_score = 0.0
-                        
-                    # Sort logos by rank_score in descending order
-                    return sorted(logos, key=lambda x: x.rank_score, reverse=True)
+            # Sort logos by rank_score in descending order
+            return sorted(logos, key=lambda x: x.rank_score, reverse=True)
 
         except Exception as e:
-            print(f"Error during logo ranking: {e}")
+            logger.error("Error during logo ranking: %s", e)
             return logos
 
+    def format_logo_report(self, results: List[LogoResult]) -> str:
+        """Format ranked logos as the human-readable report crawl_website prints when verbose."""
+        separator = "-" * 50
+        report_lines = ["", "Found logos (ranked by likelihood of being main company logo):", ""]
+        for result in results:
+            location = "header/navigation" if result.is_header else "main content"
+            report_lines += [
+                f"URL: {result.url}",
+                f"Location: {location}",
+                f"Confidence: {result.confidence}",
+                f"Rank Score: {result.rank_score}",
+                f"Description: {result.description}",
+                f"Page URL: {result.page_url}",
+                separator,
+                "",
+            ]
+        return "\n".join(report_lines) + "\n"
+
     async def crawl_website(self, url: str, skip_clearbit: bool = False, skip_google_favicon: bool = False) -> List[LogoResult]:
         """Crawl a website and find logos.
         
@@ -953,155 +1834,215 @@ class LogoCrawler:
         
         # Try Clearbit first (free, fast, reliable for established companies)
         if not skip_clearbit:
-            clearbit_result = await try_clearbit_logo(domain, url)
+            clearbit_result = await try_clearbit_logo(domain, url, session=self._get_session())
             if clearbit_result:
-                print(f"🚀 Using Clearbit logo for {domain} (skipping crawl)")
+                logger.info("Using Clearbit logo for %s (skipping crawl)", domain)
                 return [clearbit_result]
-            print(f"ℹ️  Clearbit unavailable for {domain}")
+            logger.debug("Clearbit unavailable for %s", domain)
         
         # Try Google Favicon as fallback (good coverage, lower quality)
         if not skip_google_favicon:
-            favicon_result = await try_google_favicon(domain, url)
+            favicon_result = await try_google_favicon(domain, url, session=self._get_session())
             if favicon_result:
-                print(f"🔄 Using Google favicon for {domain} (skipping crawl)")
+                logger.info("Using Google favicon for %s (skipping crawl)", domain)
                 return [favicon_result]
-            print(f"ℹ️  Google favicon unavailable for {domain}, falling back to crawler...")
+            logger.debug("Google favicon unavailable for %s, falling back to crawler", domain)
         
         try:
-            async with aiohttp.ClientSession() as session:
-                async with session.get(url, headers=BROWSER_HEADERS) as response:
-                    if response.status != 200:
-                        return []
-
-                    html = await response.text()
-
-                    # Check for meta refresh redirect (not followed by aiohttp)
-                    # This handles sites like helpify.net that use <meta http-equiv="refresh">
-                    if len(html) < 500:  # Only check short pages that might be redirect stubs
-                        meta_refresh_url = extract_meta_refresh_url(html, url)
-                        if meta_refresh_url:
-                            print(f"Found meta refresh redirect to: {meta_refresh_url}")
-                            async with session.get(meta_refresh_url, headers=BROWSER_HEADERS) as redirect_response:
-                                if redirect_response.status == 200:
-                                    html = await redirect_response.text()
-                                    url = str(redirect_response.url)
-                                    print(f"Followed meta refresh to: {url}")
-
-                    soup = BeautifulSoup(html, 'html.parser')
-                    
-                    # First, get header/nav images
-                    header_images = await self.analyze_header_nav_elements(soup, url)
-                    
-                    # Then get all other images
-                    all_images = set()
-                    for img in soup.find_all('img'):
-                        src = img.get('src')
-                        if src:
-                            full_url = urljoin(url, src)
-                            all_images.add(full_url)
-                    
-                    for svg in soup.find_all('svg'):
-                        for image in svg.find_all('image'):
-                            href = image.get('href') or image.get('xlink:href')
-                            if href:
-                                full_url = urljoin(url, href)
-                                all_images.add(full_url)
+            session = self._get_session()
+            async with session.get(url, headers=BROWSER_HEADERS) as response:
+                if response.status != 200:
+                    return []
+
+                html = await response.text()
+
+                # Check for meta refresh redirect (not followed by aiohttp)
+                # This handles sites like helpify.net that use <meta http-equiv="refresh">
+                if len(html) < 500:  # Only check short pages that might be redirect stubs
+                    meta_refresh_url = extract_meta_refresh_url(html, url)
+                    if meta_refresh_url:
+                        logger.debug("Found meta refresh redirect to: %s", meta_refresh_url)
+                        async with session.get(meta_refresh_url, headers=BROWSER_HEADERS) as redirect_response:
+                            if redirect_response.status == 200:
+                                html = await redirect_response.text()
+                                url = str(redirect_response.url)
+                                logger.debug("Followed meta refresh to: %s", url)
+
+                soup = BeautifulSoup(html, HTML_PARSER)
                     
-                    # Analyze all images
-                    results = []
-                    for image_url in all_images:
-                        result = await self.analyze_image(image_url, url)
-                        if result:
-                            # Mark if image is from header/nav
-                            result.is_header = image_url in header_images
-                            results.append(result)
+                # Collect all images in one walk, noting which are in the header/nav
+                page_images = self._collect_page_images(soup, url)
                     
-                    print(f"Crawl completed. Found {len(results)} results\n")
+                # Analyze all images concurrently
+                image_urls = list(page_images)
+                results = []
+                for image_url, result in zip(image_urls, await self._analyze_images(image_urls, url)):
+                    if result:
+                        # Mark if image is from header/nav
+                        result.is_header = page_images[image_url]
+                        results.append(result)
+
+                logger.info("Crawl completed. Found %d results", len(results))
                     
-                    if results:
-                        # Rank the logos
-                        ranked_results = await self.rank_logos(results)
+                if results:
+                    # Rank the logos
+                    ranked_results = await self.rank_logos(results)
                         
-                        print("\nFound logos (ranked by likelihood of being main company logo):\n")
-                        for result in ranked_results:
-                            location = "header/navigation" if result.is_header else "main content"
-                            print(f"URL: {result.url}")
-                            print(f"Location: {location}")
-                            print(f"Confidence: {result.confidence}")
-                            print(f"Rank Score: {result.rank_score}")
-                            print(f"Description: {result.description}")
-                            print(f"Page URL: {result.page_url}")
-                            print("-" * 50 + "\n")
+                    if self.verbose:
+                        sys.stdout.write(self.format_logo_report(ranked_results))
                         
-                        return ranked_results
+                    return ranked_results
                     
-                    return []
+                return []
                     
         except aiohttp.ClientError as e:
-            print(f"Error crawling website: {e}")
+            logger.warning("Error crawling website %s: %s", url, e)
             return []
-        except Exception as e:
-            print(f"Unexpected error: {e}")
+        except Exception:
+            logger.exception("Unexpected error crawling website %s", url)
             return []
 
+    def detect_url_column_name(self, csv_file_path: str) -> str:
+        """
+        Detect the URL column of a CSV file from its header row alone.
+        
+        Args:
+            csv_file_path: Path to the CSV file
+            
+        Returns:
+            Name of the URL column
+        """
+        with open(csv_file_path, 'r', encoding='utf-8', newline='') as file:
+            headers = next(csv.reader(file), None)
+        
+        if not headers:
+            raise ValueError("CSV file has no headers")
+        
+        # Exact matches first
+        for header in headers:
+            if header.lower().strip() in URL_COLUMN_HEADER_SET:
+                return header
+        
+        # If no exact match, try partial matches
+        for header in headers:
+            header_lower = header.lower().strip()
+            for possible in URL_COLUMN_HEADERS:
+                if possible in header_lower or header_lower in possible:
+                    return header
+        
+        raise ValueError(
+            f"Could not detect URL column. Available columns: {headers}. "
+            f"Please ensure one of these columns contains URLs: {list(URL_COLUMN_HEADERS)}"
+        )
+
+    def iter_csv_urls(self, csv_file_path: str, url_column: str) -> Iterator[str]:
+        """
+        Yield the URLs in a CSV column one row at a time.
+        
+        Empty and null-like cells are skipped, and URLs without a scheme
+        get https:// prepended.
+        
+        Args:
+            csv_file_path: Path to the CSV file
+            url_column: Name of the column holding the URLs
+            
+        Yields:
+            Normalized URLs, in file order
+        """
+        with open(csv_file_path, 'r', encoding='utf-8', newline='') as file:
+            for row in csv.DictReader(file):
+                url = (row.get(url_column) or '').strip()
+                if url.lower() not in EMPTY_URL_VALUES:
+                    # Ensure URL has protocol
+                    if not url.startswith(('http://', 'https://')):
+                        url = 'https://' + url
+                    yield url
+
     def detect_url_column(self, csv_file_path: str) -> Tuple[str, List[str]]:
         """
         Automatically detect the URL column in a CSV file.
         
+        Loads every URL into memory; process_csv_batch streams them with
+        detect_url_column_name and iter_csv_urls instead.
+        
         Args:
             csv_file_path: Path to the CSV file
             
         Returns:
             Tuple of (column_name, list_of_urls)
         """
-        possible_url_headers = [
-            'url', 'website', 'site', 'link', 'domain', 'company url', 
-            'website url', 'site url', 'company website', 'company site',
-            'web', 'webpage', 'page', 'address', 'homepage'
-        ]
+        url_column = self.detect_url_column_name(csv_file_path)
+        return url_column, list(self.iter_csv_urls(csv_file_path, url_column))
+
+    def _background_removed_png(self, image_data: bytes) -> bytes:
+        """Return PNG bytes of the image with its background removed.
         
-        with open(csv_file_path, 'r', encoding='utf-8') as file:
-            reader = csv.DictReader(file)
-            headers = reader.fieldnames
-            
-            if not headers:
-                raise ValueError("CSV file has no headers")
+        rembg's PNG output is used as-is; without rembg (or if it fails) the
+        original image is re-encoded as PNG. Blocking, so call via a thread.
+        """
+        removed = self.remove_background_bytes(image_data)
+        if removed is not None:
+            return removed
+        img_byte_arr = io.BytesIO()
+        Image.open(io.BytesIO(image_data)).save(img_byte_arr, format='PNG')
+        return img_byte_arr.getvalue()
+
+    async def _save_batch_logo(self, index: int, result: LogoResult, images_dir: Path) -> Dict:
+        """Save a background-removed copy of a batch result's logo and describe it for the results file.
+        
+        Downloads share the image semaphore with analysis, so a site with many
+        logos doesn't open more connections than a crawl would. If the image
+        can't be downloaded or saved, the entry is returned without image paths.
+        """
+        result_dict = {
+            "url": result.url,
+            "confidence": result.confidence,
+            "description": result.description,
+            "page_url": result.page_url,
+            "image_hash": result.image_hash,
+            "timestamp": result.timestamp,
+            "rank_score": result.rank_score,
+            "detection_scores": result.detection_scores,
+            "is_header": result.is_header,
+            "background_removed_image_path": None,
+            "background_removed_image_url": None,
+            "cloud_storage_url": None
+        }
+        
+        try:
+            async with self._get_semaphore('image', self.max_image_concurrency):
+                # Download the original image through the shared session, with the
+                # same content-type checks as analysis but a higher size cap
+                image_data = await self._download_image(result.url, MAX_SAVED_LOGO_BYTES)
+            if image_data is None:
+                logger.warning("Could not download logo %s to save it (error status, not an image, "
+                               "or over %d bytes)", result.url, MAX_SAVED_LOGO_BYTES)
+                return result_dict
             
-            # Find the URL column
-            url_column = None
-            for header in headers:
-                if header.lower().strip() in possible_url_headers:
-                    url_column = header
-                    break
+            # Remove background off the event loop (in the process pool when cpu_workers > 0)
+            img_bytes = await asyncio.to_thread(self._background_removed_png, image_data)
             
-            if not url_column:
-                # If no exact match, try partial matches
-                for header in headers:
-                    header_lower = header.lower().strip()
-                    for possible in possible_url_headers:
-                        if possible in header_lower or header_lower in possible:
-                            url_column = header
-                            break
-                    if url_column:
-                        break
+            # Save background-removed image locally
+            image_filename = f"logo_{index + 1}_{result.confidence:.2f}.png"
+            image_path = images_dir / image_filename
+            await asyncio.to_thread(image_path.write_bytes, img_bytes)
             
-            if not url_column:
-                raise ValueError(
-                    f"Could not detect URL column. Available columns: {headers}. "
-                    f"Please ensure one of these columns contains URLs: {possible_url_headers}"
-                )
+            # Upload to cloud storage
+            cloud_url = await self.cloud_storage.upload_image(img_bytes, image_filename)
             
-            # Extract URLs from the detected column
-            urls = []
-            for row in reader:
-                url = row[url_column].strip()
-                if url and url.lower() not in ['', 'nan', 'none', 'null']:
-                    # Ensure URL has protocol
-                    if not url.startswith(('http://', 'https://')):
-                        url = 'https://' + url
-                    urls.append(url)
+            # Create local file URL
+            local_file_url = f"file://{image_path.absolute()}"
             
-            return url_column, urls
+            # Add image paths and URLs to result
+            result_dict.update({
+                "background_removed_image_path": str(image_path),
+                "background_removed_image_url": cloud_url if cloud_url else local_file_url,
+                "cloud_storage_url": cloud_url
+            })
+        except Exception as e:
+            logger.warning("Could not save background-removed image for %s: %s", result.url, e)
+        
+        return result_dict
 
     async def process_csv_batch(self, csv_file_path: str, output_dir: str = "results", confirm_header: bool = True) -> Dict[str, List[LogoResult]]:
         """
@@ -1117,16 +2058,14 @@ class LogoCrawler:
         """
         print(f"Processing CSV file: {csv_file_path}")
         
-        # Detect URL column
-        url_column, urls = self.detect_url_column(csv_file_path)
+        # Detect URL column; rows are streamed from the file rather than loaded up front
+        url_column = self.detect_url_column_name(csv_file_path)
         
         if confirm_header:
             print(f"\nDetected URL column: '{url_column}'")
-            print(f"Found {len(urls)} URLs to process:")
-            for i, url in enumerate(urls[:5], 1):  # Show first 5 URLs
+            print("First URLs to process:")
+            for i, url in enumerate(itertools.islice(self.iter_csv_urls(csv_file_path, url_column), 5), 1):
                 print(f"  {i}. {url}")
-            if len(urls) > 5:
-                print(f"  ... and {len(urls) - 5} more")
             
             response = input("\nProceed with this column? (y/n): ").lower().strip()
             if response not in ['y', 'yes']:
@@ -1139,6 +2078,7 @@ class LogoCrawler:
         
         # Process each URL
         all_results = {}
+        total_urls = 0
         
         with Progress(
             SpinnerColumn(),
@@ -1147,9 +2087,11 @@ class LogoCrawler:
             TaskProgressColumn(),
             TextColumn("[progress.percentage]{task.percentage:>3.0f}%")
         ) as progress:
-            task = progress.add_task("Processing websites...", total=len(urls))
+            # The URL count isn't known until the file has been read
+            task = progress.add_task("Processing websites...", total=None)
             
-            for url in urls:
+            for url in self.iter_csv_urls(csv_file_path, url_column):
+                total_urls += 1
                 try:
                     progress.update(task, description=f"Processing {url}")
                     
@@ -1168,8 +2110,8 @@ class LogoCrawler:
                         images_dir = output_path / f"{domain}_{timestamp}_images"
                         images_dir.mkdir(exist_ok=True)
                         
-                        # Convert results to JSON format and save background-removed images
-                        results_dict = []
+                        # Keep confident company logos, numbered by their rank in results
+                        selected = []
                         for i, result in enumerate(results):
                             # Only process images with confidence score > 0.8
                             if result.confidence <= 0.8:
@@ -1181,87 +2123,16 @@ class LogoCrawler:
                                 print(f"Skipping non-company logo: {result.url} - {result.description}")
                                 continue
                             
-                            # Save background-removed image
-                            try:
-                                # Download the original image
-                                async with aiohttp.ClientSession() as session:
-                                    async with session.get(result.url, headers=BROWSER_HEADERS) as response:
-                                        if response.status == 200:
-                                            image_data = await response.read()
-                                            image = Image.open(io.BytesIO(image_data))
-                                            
-                                            # Remove background
-                                            image_no_bg = self.remove_background(image)
-                                            
-                                            # Save background-removed image locally
-                                            image_filename = f"logo_{i+1}_{result.confidence:.2f}.png"
-                                            image_path = images_dir / image_filename
-                                            image_no_bg.save(image_path, "PNG")
-                                            
-                                            # Convert to bytes for cloud upload
-                                            img_byte_arr = io.BytesIO()
-                                            image_no_bg.save(img_byte_arr, format='PNG')
-                                            img_bytes = img_byte_arr.getvalue()
-                                            
-                                            # Upload to cloud storage
-                                            cloud_url = await self.cloud_storage.upload_image(img_bytes, image_filename)
-                                            
-                                            # Create local file URL
-                                            local_file_url = f"file://{image_path.absolute()}"
-                                            
-                                            # Add image paths and URLs to result
-                                            result_dict = {
-                                                "url": result.url,
-                                                "confidence": result.confidence,
-                                                "description": result.description,
-                                                "page_url": result.page_url,
-                                                "image_hash": result.image_hash,
-                                                "timestamp": result.timestamp.isoformat(),
-                                                "rank_score": result.rank_score,
-                                                "detection_scores": result.detection_scores,
-                                                "is_header": result.is_header,
-                                                "background_removed_image_path": str(image_path),
-                                                "background_removed_image_url": cloud_url if cloud_url else local_file_url,
-                                                "cloud_storage_url": cloud_url
-                                            }
-                                        else:
-                                            # If image download fails, save without background-removed image
-                                            result_dict = {
-                                                "url": result.url,
-                                                "confidence": result.confidence,
-                                                "description": result.description,
-                                                "page_url": result.page_url,
-                                                "image_hash": result.image_hash,
-                                                "timestamp": result.timestamp.isoformat(),
-                                                "rank_score": result.rank_score,
-                                                "detection_scores": result.detection_scores,
-                                                "is_header": result.is_header,
-                                                "background_removed_image_path": None,
-                                                "background_removed_image_url": None,
-                                                "cloud_storage_url": None
-                                            }
-                            except Exception as e:
-                                print(f"Warning: Could not save background-removed image for {result.url}: {e}")
-                                result_dict = {
-                                    "url": result.url,
-                                    "confidence": result.confidence,
-                                    "description": result.description,
-                                    "page_url": result.page_url,
-                                    "image_hash": result.image_hash,
-                                    "timestamp": result.timestamp.isoformat(),
-                                    "rank_score": result.rank_score,
-                                    "detection_scores": result.detection_scores,
-                                    "is_header": result.is_header,
-                                    "background_removed_image_path": None,
-                                    "background_removed_image_url": None,
-                                    "cloud_storage_url": None
-                                }
-                            
-                            results_dict.append(result_dict)
+                            selected.append((i, result))
+                        
+                        # Download, remove backgrounds and upload concurrently; gather keeps the order
+                        results_dict = await asyncio.gather(
+                            *(self._save_batch_logo(i, result, images_dir) for i, result in selected)
+                        )
                         
                         # Save to file
-                        with open(filepath, 'w') as f:
-                            json.dump(results_dict, f, indent=2)
+                        with open(filepath, 'wb') as f:
+                            f.write(_json_dumps(results_dict, indent=True))
                         
                         print(f"\n✅ {url}: Found {len(results)} logos, saved {len(results_dict)} company logos (>0.8 confidence) to {filepath}")
                         if results_dict:
@@ -1284,10 +2155,10 @@ class LogoCrawler:
         # Create summary report
         summary_file = output_path / "batch_summary.json"
         summary = {
-            "processed_at": datetime.now().isoformat(),
+            "processed_at": datetime.now(),
             "csv_file": csv_file_path,
             "url_column": url_column,
-            "total_urls": len(urls),
+            "total_urls": total_urls,
             "successful_crawls": sum(1 for results in all_results.values() if results),
             "total_logos_found": sum(len(results) for results in all_results.values()),
             "results": {
@@ -1308,8 +2179,8 @@ class LogoCrawler:
             }
         }
         
-        with open(summary_file, 'w') as f:
-            json.dump(summary, f, indent=2)
+        with open(summary_file, 'wb') as f:
+            f.write(_json_dumps(summary, indent=True))
         
         print(f"\n🎉 Batch processing complete!")
         print(f"📊 Summary: {summary['successful_crawls']}/{summary['total_urls']} websites processed successfully")
@@ -1,13 +1,20 @@
+import asyncio
+import atexit
+import hashlib
+import importlib.util
 import os
+import queue
 import re
-from typing import List, Dict, Set, Optional, Tuple, Any
+import threading
+from collections import Counter, OrderedDict
+from typing import List, Dict, Set, Optional, Tuple, Any, Union
 from urllib.parse import urljoin, urlparse
 import json
 import magic
 import cv2
 import numpy as np
-from bs4 import BeautifulSoup, Tag
-import extcolors
+from bs4 import BeautifulSoup, NavigableString, Tag
+from defusedxml import ElementTree as SafeET
 from PIL import Image
 import pytesseract
 import imagehash
@@ -28,6 +35,288 @@ _tesseract_path = os.environ.get('TESSERACT_CMD') or shutil.which('tesseract')
 if _tesseract_path:
     pytesseract.pytesseract.tesseract_cmd = _tesseract_path
 
+# BeautifulSoup parser used for every page parsed by the package; lxml is a C
+# parser, several times faster than the pure-Python html.parser on real pages
+HTML_PARSER = 'lxml'
+
+# Optional: orjson parses JSON (JSON-LD blocks, API replies, caches) several times
+# faster than the stdlib; orjson.JSONDecodeError subclasses json.JSONDecodeError
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+    orjson = None  # type: ignore
+
+# Optional: xxhash for faster image cache keys
+try:
+    import xxhash
+    XXHASH_AVAILABLE = True
+except ImportError:
+    XXHASH_AVAILABLE = False
+    xxhash = None  # type: ignore
+
+# Optional: tesserocr binds libtesseract in-process, so trained data is loaded once per
+# handle instead of once per pytesseract subprocess.
+try:
+    if importlib.util.find_spec('tesserocr') is None:
+        raise ImportError("tesserocr is not installed")
+    # Cap OpenMP threads before the import since OCR calls already run in parallel
+    # worker threads; only done when tesserocr will actually be loaded
+    os.environ.setdefault('OMP_THREAD_LIMIT', '1')
+    import tesserocr
+    TESSEROCR_AVAILABLE = True
+except ImportError:
+    TESSEROCR_AVAILABLE = False
+
+# Number of tesserocr handles kept alive; each holds its own copy of the trained data
+OCR_POOL_SIZE = os.cpu_count() or 1
+
+# A quantized color counts towards the palette only if it covers at least this share
+# of the pixels, so anti-aliased edges don't inflate the count
+PALETTE_MIN_SHARE = 0.01
+
+# Logos with at most this many dominant colors get the full color_palette_score
+MAX_PALETTE_COLORS = 5
+
+# Longest side, in pixels, images are downscaled to before visual analysis
+VISUAL_ANALYSIS_MAX_SIDE = 256
+
+# Gray levels above this count as white space
+WHITE_THRESHOLD = 240
+
+# SVG elements that draw shapes, counted for the geometric score of vector logos
+SVG_SHAPE_TAGS = frozenset({'path', 'rect', 'circle', 'ellipse', 'polygon', 'polyline', 'line'})
+
+# Canny hysteresis thresholds used for geometric shape detection
+CANNY_LOW_THRESHOLD = 50
+CANNY_HIGH_THRESHOLD = 150
+
+# Optional: run Canny on the GPU when OpenCV was built with CUDA and a device is present
+try:
+    CUDA_AVAILABLE = cv2.cuda.getCudaEnabledDeviceCount() > 0
+except (AttributeError, cv2.error):
+    CUDA_AVAILABLE = False
+
+# Tesseract page segmentation modes tried in order until one yields text:
+# 7 = single line, 6 = uniform block, 3 = fully automatic
+OCR_PSM_MODES = (7, 6, 3)
+
+# Number of preceding text nodes checked for brand terms around a candidate
+BRAND_PROXIMITY_STRINGS = 5
+
+# Characters stripped from OCR output and domain names before comparing them
+NON_ALNUM_PATTERN = re.compile(r'[^a-zA-Z0-9\s]')
+
+def terms_pattern(terms) -> 're.Pattern':
+    """Compile terms into one alternation so a single regex scan finds any of them.
+    
+    Longer terms come first so overlapping terms still match at the earliest position.
+    """
+    return re.compile('|'.join(re.escape(term) for term in sorted(terms, key=len, reverse=True)))
+
+
+# Class, id, alt and nearby-text substrings that mark an element as a logo
+LOGO_TERMS = frozenset({'logo', 'brand', 'site-logo', 'company-logo', 'header-logo'})
+LOGO_TERMS_PATTERN = terms_pattern(LOGO_TERMS)
+
+# Image URL path substrings that suggest a logo asset
+LOGO_PATH_TERMS = frozenset({'logo', 'brand', 'header', 'site-id'})
+LOGO_PATH_TERMS_PATTERN = terms_pattern(LOGO_PATH_TERMS)
+
+# Image filename substrings that suggest a logo asset
+LOGO_FILENAME_TERMS = frozenset({'logo', 'brand', 'icon'})
+LOGO_FILENAME_TERMS_PATTERN = terms_pattern(LOGO_FILENAME_TERMS)
+
+# Host or path substrings typical of static asset hosting
+CDN_TERMS = frozenset({'assets', 'static', 'media', 'images', 'cdn'})
+CDN_TERMS_PATTERN = terms_pattern(CDN_TERMS)
+
+# Maximum number of per-image analyzer results kept, keyed by image content hash
+IMAGE_SCORES_CACHE_SIZE = 4096
+
+# Versioned asset paths such as /v2/ or /version-3/
+VERSION_PATTERN = re.compile(r'v\d+|version-\d+')
+
+# Metadata substrings left by design tools
+DESIGN_SOFTWARE_TERMS = frozenset({'adobe', 'sketch', 'figma', 'illustrator'})
+DESIGN_SOFTWARE_TERMS_PATTERN = terms_pattern(DESIGN_SOFTWARE_TERMS)
+
+# itemtype values pointing at schema.org vocabularies
+SCHEMA_ORG_PATTERN = re.compile(r'schema.org')
+
+
+_tesserocr_pool: Optional[queue.Queue] = None
+_tesserocr_pool_lock = threading.Lock()
+
+
+def _get_tesserocr_pool() -> queue.Queue:
+    """Return the shared pool of tesserocr handles, creating it on first use."""
+    global _tesserocr_pool
+    with _tesserocr_pool_lock:
+        if _tesserocr_pool is None:
+            pool = queue.Queue()
+            for _ in range(OCR_POOL_SIZE):
+                pool.put(tesserocr.PyTessBaseAPI(psm=tesserocr.PSM.SINGLE_LINE))
+            _tesserocr_pool = pool
+            atexit.register(_close_tesserocr_pool)
+        return _tesserocr_pool
+
+
+def _close_tesserocr_pool():
+    """End the pooled tesserocr handles, releasing their trained data.
+    
+    Registered with atexit when the pool is created; handles checked out by
+    a running OCR call are left to the interpreter.
+    """
+    global _tesserocr_pool
+    with _tesserocr_pool_lock:
+        pool, _tesserocr_pool = _tesserocr_pool, None
+    if pool is None:
+        return
+    while True:
+        try:
+            pool.get_nowait().End()
+        except queue.Empty:
+            break
+
+
+def count_dominant_colors(img: np.ndarray) -> int:
+    """Count the dominant colors of a 3-channel image after quantizing to 5 bits per channel.
+    
+    Channel order doesn't matter, so OpenCV's BGR arrays can be passed as-is.
+    """
+    pixels = img.reshape(-1, 3) >> 3
+    codes = (pixels[:, 0].astype(np.uint16) << 10) | (pixels[:, 1].astype(np.uint16) << 5) | pixels[:, 2]
+    counts = np.bincount(codes, minlength=1 << 15)
+    return int(np.count_nonzero(counts >= PALETTE_MIN_SHARE * len(codes)))
+
+
+# CUDA detectors and device buffers are not thread-safe, so each thread keeps its own
+_cuda_state = threading.local()
+
+
+def detect_edges(gray: np.ndarray) -> np.ndarray:
+    """Run Canny over a grayscale image, on the GPU when CUDA is available."""
+    if CUDA_AVAILABLE:
+        if not hasattr(_cuda_state, 'detector'):
+            _cuda_state.detector = cv2.cuda.createCannyEdgeDetector(CANNY_LOW_THRESHOLD, CANNY_HIGH_THRESHOLD)
+            _cuda_state.gpu_mat = cv2.cuda_GpuMat()
+        _cuda_state.gpu_mat.upload(gray)
+        return _cuda_state.detector.detect(_cuda_state.gpu_mat).download()
+    return cv2.Canny(gray, CANNY_LOW_THRESHOLD, CANNY_HIGH_THRESHOLD)
+
+
+def decode_image(image_data: bytes) -> Tuple[Image.Image, np.ndarray]:
+    """Decode image bytes once into a PIL image and a BGR array for OpenCV.
+    
+    The PIL image keeps the original mode and info (transparency, metadata);
+    the array is what cv2.imdecode(..., IMREAD_COLOR) would have produced.
+    """
+    img = Image.open(io.BytesIO(image_data))
+    img.load()
+    return img, cv2.cvtColor(np.asarray(img.convert('RGB')), cv2.COLOR_RGB2BGR)
+
+
+def previous_strings(element: Tag, limit: int) -> List[str]:
+    """Return up to limit text nodes preceding element in document order, nearest first.
+    
+    Equivalent to element.find_all_previous(string=True, limit=limit) without
+    building a matcher and result set for every call.
+    """
+    strings = []
+    for node in element.previous_elements:
+        if isinstance(node, NavigableString):
+            strings.append(str(node))
+            if len(strings) >= limit:
+                break
+    return strings
+
+
+def is_svg(image_data: bytes) -> bool:
+    """Check whether image bytes are an SVG document by sniffing the start of the file."""
+    head = image_data[:1024].lstrip().lower()
+    return head.startswith(b'<') and b'<svg' in head
+
+
+def summarize_svg(image_data: bytes) -> Dict[str, Any]:
+    """Read what the analyzers need straight from SVG markup, without rasterizing.
+    
+    Returns:
+        {'width': float, 'height': float, 'shapes': int, 'colors': set, 'text': str};
+        width and height are 0.0 when neither viewBox nor width/height are given.
+    
+    Raises:
+        xml.etree.ElementTree.ParseError: for malformed markup.
+        defusedxml.DefusedXmlException: for documents declaring entities.
+    """
+    # SVGs come from arbitrary sites, so entity declarations and external
+    # references are refused rather than expanded
+    root = SafeET.fromstring(image_data)
+    width = height = 0.0
+    view_box = root.get('viewBox', '').replace(',', ' ').split()
+    try:
+        if len(view_box) == 4:
+            width, height = float(view_box[2]), float(view_box[3])
+        else:
+            width = float(re.sub(r'[^0-9.]', '', root.get('width', '')) or 0)
+            height = float(re.sub(r'[^0-9.]', '', root.get('height', '')) or 0)
+    except ValueError:
+        pass
+
+    shapes = 0
+    colors = set()
+    texts = []
+    for node in root.iter():
+        tag = node.tag.rsplit('}', 1)[-1]
+        if tag in SVG_SHAPE_TAGS:
+            shapes += 1
+        elif tag == 'text':
+            texts.append(''.join(node.itertext()))
+        for attr in ('fill', 'stroke'):
+            color = node.get(attr)
+            if color and color != 'none':
+                colors.add(color.lower())
+    return {
+        'width': width,
+        'height': height,
+        'shapes': shapes,
+        'colors': colors,
+        'text': _clean_ocr_text(' '.join(texts)),
+    }
+
+
+def _json_loads(data):
+    """Parse JSON from bytes or str, using orjson when it is installed.
+    
+    orjson.JSONDecodeError subclasses json.JSONDecodeError, so callers can
+    catch the stdlib exception either way. str subclasses (such as the
+    NavigableString from a parsed <script>) are converted to plain str,
+    since orjson rejects them.
+    """
+    if ORJSON_AVAILABLE:
+        if isinstance(data, str) and type(data) is not str:
+            data = str(data)
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def _content_hash(data: bytes) -> str:
+    """Hash bytes into a 32-character hex cache key.
+    
+    Uses XXH3-128 when xxhash is installed, otherwise BLAKE2b with a
+    128-bit digest; cryptographic strength isn't needed for cache keys.
+    """
+    if XXHASH_AVAILABLE:
+        return xxhash.xxh3_128_hexdigest(data)
+    return hashlib.blake2b(data, digest_size=16).hexdigest()
+
+
+def _clean_ocr_text(text: str) -> str:
+    """Strip OCR output down to alphanumerics and whitespace."""
+    return NON_ALNUM_PATTERN.sub('', text).strip()
+
+
 def extract_domain(url: str) -> str:
     """Extract domain name from URL."""
     try:
@@ -56,11 +345,65 @@ class LogoCandidate:
     schema_markup: str = ''
     classification: str = "unknown"  # Can be "company", "third_party", or "design_element"
 
+@dataclass
+class PageContext:
+    """A page parsed once and shared by every analyzer that needs its markup."""
+    url: str
+    html: str
+    soup: BeautifulSoup
+
+    @classmethod
+    def parse(cls, url: str, html: str) -> 'PageContext':
+        """Parse html with the package's HTML parser."""
+        return cls(url=url, html=html, soup=BeautifulSoup(html, HTML_PARSER))
+
+
 class LogoDetectionStrategies:
-    def __init__(self, twitter_api_key: Optional[str] = None):
+    def __init__(self, twitter_api_key: Optional[str] = None,
+                 session: Optional[aiohttp.ClientSession] = None):
+        """
+        Args:
+            twitter_api_key: Optional Twitter API bearer token
+            session: Optional shared HTTP session; the strategies never close a session they didn't create
+        """
         self.twitter_api_key = twitter_api_key
+        self._session = session
+        self._owns_session = session is None
         self.twitter_client = self._setup_twitter_client() if twitter_api_key else None
         self.logger = logging.getLogger(__name__)
+        # Each OCR call runs a tesseract subprocess in a worker thread; capped at the core
+        # count by a semaphore created in the running event loop (see _get_ocr_semaphore)
+        self._ocr_semaphore: Optional[Tuple[asyncio.AbstractEventLoop, asyncio.Semaphore]] = None
+        # LRU of (analyzer, content digest) -> result, so a site-wide logo is decoded and OCR'd once
+        self._image_scores: OrderedDict = OrderedDict()
+        # Most recently decoded (image_data, decode_image result); the analyzers of one
+        # candidate receive the same bytes object, so they share a single decode
+        self._last_decoded: Optional[Tuple[bytes, Tuple[Image.Image, np.ndarray]]] = None
+        # Most recent (image_data, content key), reused the same way for the results cache
+        self._last_key: Optional[Tuple[bytes, str]] = None
+        # Twitter match score per domain; every candidate on a site shares the same lookup
+        self._twitter_scores: Dict[str, float] = {}
+
+    def _get_session(self) -> aiohttp.ClientSession:
+        """Return the HTTP session, creating a pooled one on first use."""
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(limit=100, limit_per_host=10, ttl_dns_cache=300)
+            self._session = aiohttp.ClientSession(connector=connector)
+            self._owns_session = True
+        return self._session
+
+    async def close(self):
+        """Close the HTTP session if it was created here."""
+        if self._owns_session and self._session is not None and not self._session.closed:
+            await self._session.close()
+        if self._owns_session:
+            self._session = None
+
+    async def __aenter__(self) -> "LogoDetectionStrategies":
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.close()
 
     def _setup_twitter_client(self) -> Optional[tweepy.Client]:
         try:
@@ -79,16 +422,14 @@ class LogoDetectionStrategies:
         }
 
         # Check class names and IDs
-        classes = element.get('class', [])
-        element_id = element.get('id', '')
-        logo_terms = {'logo', 'brand', 'site-logo', 'company-logo', 'header-logo'}
-        scores['class_score'] = any(term in str(classes).lower() or term in str(element_id).lower() 
-                                  for term in logo_terms)
+        classes = str(element.get('class', [])).lower()
+        element_id = str(element.get('id', '')).lower()
+        scores['class_score'] = bool(LOGO_TERMS_PATTERN.search(classes) or LOGO_TERMS_PATTERN.search(element_id))
 
         # Check alt text and title
         alt_text = element.get('alt', '').lower()
         title = element.get('title', '').lower()
-        scores['alt_text_score'] = any(term in alt_text or term in title for term in logo_terms)
+        scores['alt_text_score'] = bool(LOGO_TERMS_PATTERN.search(alt_text) or LOGO_TERMS_PATTERN.search(title))
 
         # Check if image links to homepage
         parent_a = element.find_parent('a')
@@ -99,13 +440,29 @@ class LogoDetectionStrategies:
             scores['homepage_link_score'] = parsed_href.netloc == parsed_base.netloc and parsed_href.path in ['/', '/home']
 
         # Check proximity to brand name/company name
-        surrounding_text = ''.join(s.string for s in element.find_all_previous(string=True, limit=5))
-        scores['brand_proximity_score'] = any(term in surrounding_text.lower() for term in logo_terms)
+        surrounding_text = ''.join(previous_strings(element, BRAND_PROXIMITY_STRINGS)).lower()
+        scores['brand_proximity_score'] = bool(LOGO_TERMS_PATTERN.search(surrounding_text))
 
         return scores
 
-    async def analyze_structural_position(self, element: Tag, all_pages_elements: List[Tag]) -> Dict[str, float]:
-        """Analyze structural position in the DOM."""
+    def count_element_paths(self, elements: List[Tag]) -> Counter:
+        """Count DOM paths across elements so consistency checks become a single lookup.
+        
+        Build this once per crawl and pass it to analyze_structural_position for every
+        candidate instead of recomputing each element's path per candidate.
+        """
+        memo: Dict[int, str] = {}
+        return Counter(self._get_element_path(e, memo) for e in elements)
+
+    async def analyze_structural_position(self, element: Tag, all_pages_elements: List[Tag],
+                                          path_counts: Optional[Counter] = None) -> Dict[str, float]:
+        """Analyze structural position in the DOM.
+        
+        Args:
+            element: The candidate's element.
+            all_pages_elements: Elements collected across pages, used for the consistency score.
+            path_counts: Precomputed count_element_paths(all_pages_elements), if available.
+        """
         scores = {
             'dom_depth_score': 0.0,
             'position_score': 0.0,
@@ -122,55 +479,223 @@ class LogoDetectionStrategies:
             scores['position_score'] = any(pos in parent_box.lower() for pos in ['top', 'left: 0', 'margin-left: auto'])
 
         # Check consistency across pages
-        if all_pages_elements:
-            element_path = self._get_element_path(element)
-            matching_elements = sum(1 for e in all_pages_elements if self._get_element_path(e) == element_path)
-            scores['consistency_score'] = matching_elements / len(all_pages_elements)
+        if path_counts is None and all_pages_elements:
+            path_counts = self.count_element_paths(all_pages_elements)
+        if path_counts:
+            scores['consistency_score'] = path_counts[self._get_element_path(element)] / sum(path_counts.values())
 
         return scores
 
-    async def analyze_image_technical(self, image_url: str, image_data: bytes) -> Dict[str, float]:
-        """Analyze technical aspects of the image."""
+    def _decode(self, image_data: bytes) -> Tuple[Image.Image, np.ndarray]:
+        """Return decode_image(image_data), reusing the previous result for the same bytes."""
+        if self._last_decoded is not None and self._last_decoded[0] is image_data:
+            return self._last_decoded[1]
+        decoded = decode_image(image_data)
+        self._last_decoded = (image_data, decoded)
+        return decoded
+
+    def _image_key(self, image_data: bytes) -> str:
+        """Content key for the per-image results cache.
+        
+        Hashed once per image: the analyzers of one candidate share the same
+        bytes object, so the previous digest is reused, as _decode does.
+        Uses _content_hash, the crawler's cache key, so callers that already
+        hold that hash can pass it to the analyzers as image_hash instead.
+        """
+        if self._last_key is not None and self._last_key[0] is image_data:
+            return self._last_key[1]
+        key = _content_hash(image_data)
+        self._last_key = (image_data, key)
+        return key
+
+    def _get_image_scores(self, key: Tuple[str, str]) -> Optional[Any]:
+        """Return a cached analyzer result, marking it recently used."""
+        entry = self._image_scores.get(key)
+        if entry is not None:
+            self._image_scores.move_to_end(key)
+        return entry
+
+    def _set_image_scores(self, key: Tuple[str, str], entry: Any) -> None:
+        """Cache an analyzer result, evicting the least recently used one when full."""
+        self._image_scores[key] = entry
+        if len(self._image_scores) > IMAGE_SCORES_CACHE_SIZE:
+            self._image_scores.popitem(last=False)
+
+    async def analyze_image_technical(self, image_url: str, image_data: bytes,
+                                      image_hash: Optional[str] = None) -> Dict[str, float]:
+        """Analyze technical aspects of the image.
+        
+        Pass image_hash when the caller already has a content hash of image_data.
+        """
+        # Everything except the filename depends only on the bytes, so that part is
+        # cached; failures aren't, so a transient error doesn't stick to the image
+        key = ('technical', image_hash or self._image_key(image_data))
+        cached = self._get_image_scores(key)
+        if cached is None:
+            try:
+                cached = await asyncio.to_thread(self._analyze_image_bytes_technical, image_data)
+                self._set_image_scores(key, cached)
+            except Exception as e:
+                self.logger.error(f"Error analyzing image technical aspects: {e}")
+                cached = {
+                    'aspect_ratio_score': 0.0,
+                    'transparency_score': 0.0,
+                    'format_score': 0.0,
+                    'size_score': 0.0
+                }
+        scores = dict(cached)
+
+        # Analyze filename
+        filename = os.path.basename(urlparse(image_url).path).lower()
+        scores['filename_score'] = bool(LOGO_FILENAME_TERMS_PATTERN.search(filename))
+
+        return scores
+
+    def _analyze_image_bytes_technical(self, image_data: bytes) -> Dict[str, float]:
+        """Score format, aspect ratio, transparency and size from the image bytes.
+        
+        Raises if the image can't be parsed or decoded.
+        """
         scores = {
             'aspect_ratio_score': 0.0,
             'transparency_score': 0.0,
             'format_score': 0.0,
-            'filename_score': 0.0,
             'size_score': 0.0
         }
 
-        try:
-            # Check file format
-            mime = magic.from_buffer(image_data, mime=True)
-            scores['format_score'] = 1.0 if mime in ['image/svg+xml', 'image/png'] else 0.5
-
-            # Analyze filename
-            filename = os.path.basename(urlparse(image_url).path).lower()
-            scores['filename_score'] = any(term in filename for term in ['logo', 'brand', 'icon'])
-
-            # Image analysis
-            img = Image.open(io.BytesIO(image_data))
-            width, height = img.size
-
-            # Aspect ratio analysis (prefer ratios between 0.5 and 2.0)
-            aspect_ratio = width / height
-            scores['aspect_ratio_score'] = 1.0 if 0.5 <= aspect_ratio <= 2.0 else 0.0
-
-            # Check for transparency
-            if img.mode in ('RGBA', 'LA') or (img.mode == 'P' and 'transparency' in img.info):
-                scores['transparency_score'] = 1.0
+        # SVGs are scored from their markup; vector logos scale to any size
+        if is_svg(image_data):
+            svg = summarize_svg(image_data)
+            scores['format_score'] = 1.0
+            scores['transparency_score'] = 1.0
+            scores['size_score'] = 1.0
+            if svg['width'] and svg['height']:
+                aspect_ratio = svg['width'] / svg['height']
+                scores['aspect_ratio_score'] = 1.0 if 0.5 <= aspect_ratio <= 2.0 else 0.0
+            return scores
+
+        # Check file format
+        mime = magic.from_buffer(image_data, mime=True)
+        scores['format_score'] = 1.0 if mime in ['image/svg+xml', 'image/png'] else 0.5
+
+        # Image analysis
+        img, _ = self._decode(image_data)
+        width, height = img.size
+
+        # Aspect ratio analysis (prefer ratios between 0.5 and 2.0)
+        aspect_ratio = width / height
+        scores['aspect_ratio_score'] = 1.0 if 0.5 <= aspect_ratio <= 2.0 else 0.0
+
+        # Check for transparency
+        if img.mode in ('RGBA', 'LA') or (img.mode == 'P' and 'transparency' in img.info):
+            scores['transparency_score'] = 1.0
+
+        # Size analysis (prefer medium-sized images)
+        area = width * height
+        scores['size_score'] = 1.0 if 5000 <= area <= 100000 else 0.0
 
-            # Size analysis (prefer medium-sized images)
-            area = width * height
-            scores['size_score'] = 1.0 if 5000 <= area <= 100000 else 0.0
+        return scores
 
-        except Exception as e:
-            self.logger.error(f"Error analyzing image technical aspects: {e}")
+    def _ocr_text(self, img) -> str:
+        """Run OCR over OCR_PSM_MODES until one returns text; blocking, so call via a thread.
+        
+        Uses a pooled tesserocr handle when available, falling back to pytesseract.
+        """
+        if TESSEROCR_AVAILABLE:
+            if not isinstance(img, Image.Image):
+                img = Image.fromarray(img if img.ndim == 2 else cv2.cvtColor(img, cv2.COLOR_BGR2RGB))
+            pool = _get_tesserocr_pool()
+            api = pool.get()
+            try:
+                for psm in OCR_PSM_MODES:
+                    # Tesseract keeps its first recognition result for an image,
+                    # so it has to be set again for each page segmentation mode
+                    api.SetPageSegMode(psm)
+                    api.SetImage(img)
+                    text = _clean_ocr_text(api.GetUTF8Text())
+                    self.logger.debug("OCR text (PSM %d): %s", psm, text)
+                    if text:
+                        return text
+                return ''
+            finally:
+                api.Clear()
+                pool.put(api)
+
+        for psm in OCR_PSM_MODES:
+            text = _clean_ocr_text(pytesseract.image_to_string(img, config=f'--psm {psm} --oem 3'))
+            self.logger.debug("OCR text (PSM %d): %s", psm, text)
+            if text:
+                return text
+        return ''
+
+    def _get_ocr_semaphore(self) -> asyncio.Semaphore:
+        """Return the OCR semaphore for the running event loop, creating it on first use.
+        
+        On Python 3.9 a semaphore binds to the loop current at construction, so it
+        isn't built in __init__, which may run outside the loop that uses it.
+        """
+        loop = asyncio.get_running_loop()
+        if self._ocr_semaphore is None or self._ocr_semaphore[0] is not loop:
+            self._ocr_semaphore = (loop, asyncio.Semaphore(os.cpu_count() or 1))
+        return self._ocr_semaphore[1]
+
+    async def _ocr_text_async(self, img) -> str:
+        """Run _ocr_text in a worker thread, bounded so concurrent callers don't oversubscribe the CPU."""
+        async with self._get_ocr_semaphore():
+            return await asyncio.to_thread(self._ocr_text, img)
+
+    async def analyze_visual_characteristics_batch(self, items: List[Tuple[bytes, LogoCandidate]]) -> List[Dict[str, float]]:
+        """Analyze several images concurrently; OCR subprocesses overlap up to the core count.
+        
+        Returns one score dict per (image_data, logo_candidate) item, in order.
+        """
+        return list(await asyncio.gather(
+            *(self.analyze_visual_characteristics(image_data, logo_candidate) for image_data, logo_candidate in items)
+        ))
+
+    def _prepare_visual(self, image_data: bytes) -> Tuple[np.ndarray, np.ndarray]:
+        """Decode and downscale an image for visual analysis, returning (BGR, gray)."""
+        # OpenCV (BGR) pixels, shared with the other analyzers of this image
+        _, img = self._decode(image_data)
+
+        # Logos are small; analyze at a bounded resolution and share one gray buffer
+        h, w = img.shape[:2]
+        scale = VISUAL_ANALYSIS_MAX_SIDE / max(h, w)
+        if scale < 1:
+            img = cv2.resize(img, None, fx=scale, fy=scale, interpolation=cv2.INTER_AREA)
+        return img, cv2.cvtColor(img, cv2.COLOR_BGR2GRAY)
+
+    def _visual_pixel_scores(self, img: np.ndarray, gray: np.ndarray) -> Dict[str, float]:
+        """Score color palette, shape complexity and white space; blocking, so call via a thread."""
+        scores = {}
+
+        # Color palette analysis
+        scores['color_palette_score'] = 1.0 if count_dominant_colors(img) <= MAX_PALETTE_COLORS else 0.0  # Prefer limited color palettes
+
+        # Geometric shape detection
+        edges = detect_edges(gray)
+        contours, _ = cv2.findContours(edges, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
+        scores['geometric_score'] = 1.0 if len(contours) < 20 else 0.0  # Prefer simpler shapes
+
+        # White space analysis; threshold + countNonZero stay in OpenCV's uint8 kernels
+        _, white_mask = cv2.threshold(gray, WHITE_THRESHOLD, 255, cv2.THRESH_BINARY)
+        scores['whitespace_score'] = cv2.countNonZero(white_mask) / gray.size
 
         return scores
 
-    async def analyze_visual_characteristics(self, image_data: bytes, logo_candidate: LogoCandidate) -> Dict[str, float]:
-        """Analyze visual characteristics of the image."""
+    async def analyze_visual_characteristics(self, image_data: bytes, logo_candidate: LogoCandidate,
+                                             image_hash: Optional[str] = None) -> Dict[str, float]:
+        """Analyze visual characteristics of the image.
+        
+        Pass image_hash when the caller already has a content hash of image_data.
+        Only successful analyses are cached.
+        """
+        key = ('visual', image_hash or self._image_key(image_data))
+        cached = self._get_image_scores(key)
+        if cached is not None:
+            scores, logo_candidate.text = cached
+            return dict(scores)
+
         scores = {
             'text_presence_score': 0.0,
             'color_palette_score': 0.0,
@@ -179,57 +704,65 @@ class LogoDetectionStrategies:
         }
 
         try:
-            # Convert to OpenCV format
-            nparr = np.frombuffer(image_data, np.uint8)
-            img = cv2.imdecode(nparr, cv2.IMREAD_COLOR)
-
-            # Text detection using OCR with multiple PSM modes
-            text = ''
-            
-            # Try PSM 7 (single line of text) first
-            text = pytesseract.image_to_string(img, config='--psm 7 --oem 3')
-            text = re.sub(r'[^a-zA-Z0-9\s]', '', text).strip()
-            print(f"DEBUG: OCR text (PSM 7): {text}")
-            
-            # If no text found, try PSM 6 (uniform block of text)
-            if not text:
-                text = pytesseract.image_to_string(img, config='--psm 6 --oem 3')
-                text = re.sub(r'[^a-zA-Z0-9\s]', '', text).strip()
-                print(f"DEBUG: OCR text (PSM 6): {text}")
-            
-            # If still no text found, try PSM 3 (fully automatic page segmentation)
-            if not text:
-                text = pytesseract.image_to_string(img, config='--psm 3 --oem 3')
-                text = re.sub(r'[^a-zA-Z0-9\s]', '', text).strip()
-                print(f"DEBUG: OCR text (PSM 3): {text}")
+            # SVGs carry their text, shapes and colors in the markup: no decode or OCR
+            if is_svg(image_data):
+                svg = summarize_svg(image_data)
+                logo_candidate.text = svg['text']
+                scores['text_presence_score'] = 1.0 if svg['text'] else 0.0
+                scores['color_palette_score'] = 1.0 if len(svg['colors']) <= MAX_PALETTE_COLORS else 0.0
+                scores['geometric_score'] = 1.0 if svg['shapes'] < 20 else 0.0
+                self._set_image_scores(key, (dict(scores), logo_candidate.text))
+                return scores
+
+            # Decoding and the pixel passes are CPU-bound; OpenCV and NumPy release
+            # the GIL, so they run in worker threads alongside OCR
+            img, gray = await asyncio.to_thread(self._prepare_visual, image_data)
+            text, pixel_scores = await asyncio.gather(
+                self._ocr_text_async(gray),
+                asyncio.to_thread(self._visual_pixel_scores, img, gray),
+            )
             
             # Store the extracted text in the logo candidate
             logo_candidate.text = text
             
             scores['text_presence_score'] = 1.0 if text.strip() else 0.0
-            
-            # Color palette analysis
-            colors = extcolors.extract_from_image(Image.fromarray(cv2.cvtColor(img, cv2.COLOR_BGR2RGB)))
-            scores['color_palette_score'] = 1.0 if len(colors[0]) <= 5 else 0.0  # Prefer limited color palettes
-
-            # Geometric shape detection
-            gray = cv2.cvtColor(img, cv2.COLOR_BGR2GRAY)
-            edges = cv2.Canny(gray, 50, 150)
-            contours, _ = cv2.findContours(edges, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
-            scores['geometric_score'] = 1.0 if len(contours) < 20 else 0.0  # Prefer simpler shapes
-
-            # White space analysis
-            white_pixels = np.sum(gray > 240)
-            total_pixels = gray.size
-            scores['whitespace_score'] = white_pixels / total_pixels
+            scores.update(pixel_scores)
+            self._set_image_scores(key, (dict(scores), logo_candidate.text))
 
         except Exception as e:
             self.logger.error(f"Error analyzing visual characteristics: {e}")
 
         return scores
 
-    async def analyze_multi_page_consistency(self, image_url: str, all_pages_images: List[Dict]) -> Dict[str, float]:
-        """Analyze image consistency across multiple pages."""
+    def index_page_images(self, all_pages_images: List[Dict]) -> Dict[str, Dict[str, Any]]:
+        """Aggregate images collected across pages by URL in a single pass.
+        
+        Build this once per crawl and pass it to analyze_multi_page_consistency for
+        every candidate instead of rescanning the full list per candidate.
+        
+        Returns:
+            {url: {'count': int, 'positions': set, 'sizes': set, 'in_template': bool}}
+        """
+        index: Dict[str, Dict[str, Any]] = {}
+        for img in all_pages_images:
+            entry = index.get(img['url'])
+            if entry is None:
+                entry = index[img['url']] = {'count': 0, 'positions': set(), 'sizes': set(), 'in_template': True}
+            entry['count'] += 1
+            entry['positions'].add(img['position'])
+            entry['sizes'].add(img['size'])
+            entry['in_template'] = entry['in_template'] and bool(img['in_template'])
+        return index
+
+    async def analyze_multi_page_consistency(self, image_url: str, all_pages_images: List[Dict],
+                                             images_index: Optional[Dict[str, Dict[str, Any]]] = None) -> Dict[str, float]:
+        """Analyze image consistency across multiple pages.
+        
+        Args:
+            image_url: The candidate image's URL.
+            all_pages_images: Images collected across pages.
+            images_index: Precomputed index_page_images(all_pages_images), if available.
+        """
         scores = {
             'appearance_score': 0.0,
             'position_consistency_score': 0.0,
@@ -238,21 +771,25 @@ class LogoDetectionStrategies:
         }
 
         try:
-            # Count appearances
-            appearances = sum(1 for img in all_pages_images if img['url'] == image_url)
-            scores['appearance_score'] = appearances / len(all_pages_images)
+            if images_index is None:
+                images_index = self.index_page_images(all_pages_images)
+            entry = images_index.get(image_url)
+            if entry is None:
+                return scores
+
+            # Count appearances; callers may pass only the index, so fall back to
+            # the total it recorded
+            total = len(all_pages_images) or sum(e['count'] for e in images_index.values())
+            scores['appearance_score'] = entry['count'] / total
 
             # Position consistency
-            positions = [img['position'] for img in all_pages_images if img['url'] == image_url]
-            scores['position_consistency_score'] = len(set(positions)) == 1
+            scores['position_consistency_score'] = len(entry['positions']) == 1
 
             # Size consistency
-            sizes = [img['size'] for img in all_pages_images if img['url'] == image_url]
-            scores['size_consistency_score'] = len(set(sizes)) == 1
+            scores['size_consistency_score'] = len(entry['sizes']) == 1
 
             # Template analysis (check if image appears in header/footer)
-            template_positions = [img['in_template'] for img in all_pages_images if img['url'] == image_url]
-            scores['template_score'] = all(template_positions)
+            scores['template_score'] = entry['in_template']
 
         except Exception as e:
             self.logger.error(f"Error analyzing multi-page consistency: {e}")
@@ -271,19 +808,27 @@ class LogoDetectionStrategies:
         path = parsed_url.path.lower()
 
         # Check path for logo-related terms
-        scores['path_score'] = any(term in path for term in ['logo', 'brand', 'header', 'site-id'])
+        scores['path_score'] = bool(LOGO_PATH_TERMS_PATTERN.search(path))
 
         # Check for CDN patterns
-        cdn_patterns = ['assets', 'static', 'media', 'images', 'cdn']
-        scores['cdn_score'] = any(pattern in parsed_url.netloc or pattern in path for pattern in cdn_patterns)
+        scores['cdn_score'] = bool(CDN_TERMS_PATTERN.search(parsed_url.netloc) or CDN_TERMS_PATTERN.search(path))
 
         # Check for versioning
-        scores['versioning_score'] = bool(re.search(r'v\d+|version-\d+', path))
+        scores['versioning_score'] = bool(VERSION_PATTERN.search(path))
 
         return scores
 
-    async def analyze_metadata(self, image_data: bytes) -> Dict[str, float]:
-        """Analyze image metadata."""
+    async def analyze_metadata(self, image_data: bytes, image_hash: Optional[str] = None) -> Dict[str, float]:
+        """Analyze image metadata.
+        
+        Pass image_hash when the caller already has a content hash of image_data.
+        Only successful analyses are cached.
+        """
+        key = ('metadata', image_hash or self._image_key(image_data))
+        cached = self._get_image_scores(key)
+        if cached is not None:
+            return dict(cached)
+
         scores = {
             'copyright_score': 0.0,
             'software_score': 0.0,
@@ -292,15 +837,19 @@ class LogoDetectionStrategies:
         }
 
         try:
-            img = Image.open(io.BytesIO(image_data))
+            # Raster metadata only; SVGs would just fail to decode
+            if is_svg(image_data):
+                return scores
+
+            img, _ = self._decode(image_data)
             metadata = img.info
+            metadata_text = str(metadata).lower()
 
             # Check for copyright information
-            scores['copyright_score'] = 'copyright' in str(metadata).lower()
+            scores['copyright_score'] = 'copyright' in metadata_text
 
             # Check for design software signatures
-            design_software = ['adobe', 'sketch', 'figma', 'illustrator']
-            scores['software_score'] = any(sw in str(metadata).lower() for sw in design_software)
+            scores['software_score'] = bool(DESIGN_SOFTWARE_TERMS_PATTERN.search(metadata_text))
 
             # Check creation date (prefer recent files)
             if 'creation_date' in metadata:
@@ -308,15 +857,39 @@ class LogoDetectionStrategies:
                 scores['date_score'] = 1.0 if creation_year >= 2020 else 0.5
 
             # Check for brand guidelines references
-            scores['guidelines_score'] = 'brand' in str(metadata).lower() or 'guidelines' in str(metadata).lower()
+            scores['guidelines_score'] = 'brand' in metadata_text or 'guidelines' in metadata_text
+            self._set_image_scores(key, dict(scores))
 
         except Exception as e:
             self.logger.error(f"Error analyzing metadata: {e}")
 
         return scores
 
-    async def analyze_social_media(self, domain: str) -> Dict[str, float]:
-        """Analyze social media presence and cross-reference logos."""
+    def _lookup_twitter_match(self, domain: str) -> float:
+        """Search recent tweets linking to domain and check their authors; blocking, so call via a thread.
+        
+        Authors come back in the same request through the author_id expansion,
+        so there is no follow-up user lookup per tweet.
+        """
+        response = self.twitter_client.search_recent_tweets(
+            query=f"url:{domain}",
+            max_results=10,
+            expansions='author_id',
+            user_fields='profile_image_url',
+        )
+        users = {user.id: user for user in (response.includes or {}).get('users', [])}
+        for tweet in response.data or []:
+            if domain in tweet.text.lower() and tweet.author_id in users:
+                return 1.0
+        return 0.0
+
+    async def analyze_social_media(self, domain: str, page: Optional[PageContext] = None) -> Dict[str, float]:
+        """Analyze social media presence and cross-reference logos.
+        
+        Args:
+            domain: The site's domain.
+            page: The already-parsed homepage; fetched from https://{domain} when omitted.
+        """
         scores = {
             'twitter_match_score': 0.0,
             'og_image_score': 0.0,
@@ -326,44 +899,42 @@ class LogoDetectionStrategies:
         try:
             # Check Twitter profile image
             if self.twitter_client:
-                try:
-                    # Search for the company's Twitter account
-                    query = f"url:{domain}"
-                    response = self.twitter_client.search_recent_tweets(query=query, max_results=10)
-                    if response.data:
-                        for tweet in response.data:
-                            if domain in tweet.text.lower():
-                                author_id = tweet.author_id
-                                user = self.twitter_client.get_user(id=author_id)
-                                if user.data:
-                                    profile_image_url = user.data.profile_image_url
-                                    scores['twitter_match_score'] = 1.0
-                except Exception as e:
-                    self.logger.warning(f"Twitter API error: {e}")
+                if domain not in self._twitter_scores:
+                    try:
+                        # tweepy is synchronous; keep it off the event loop
+                        self._twitter_scores[domain] = await asyncio.to_thread(self._lookup_twitter_match, domain)
+                    except Exception as e:
+                        self.logger.warning(f"Twitter API error: {e}")
+                scores['twitter_match_score'] = self._twitter_scores.get(domain, 0.0)
 
             # Check OpenGraph and Twitter Card images
-            async with aiohttp.ClientSession() as session:
-                async with session.get(f"https://{domain}") as response:
+            if page is None:
+                async with self._get_session().get(f"https://{domain}") as response:
                     if response.status == 200:
-                        html = await response.text()
-                        soup = BeautifulSoup(html, 'html.parser')
-                        
-                        og_image = soup.find('meta', property='og:image')
-                        twitter_image = soup.find('meta', name='twitter:image')
-                        
-                        scores['og_image_score'] = 1.0 if og_image or twitter_image else 0.0
-
-                        # Check favicon
-                        favicon = soup.find('link', rel='icon') or soup.find('link', rel='shortcut icon')
-                        scores['favicon_score'] = 1.0 if favicon else 0.0
+                        page = PageContext.parse(str(response.url), await response.text())
+
+            if page is not None:
+                soup = page.soup
+                og_image = soup.find('meta', property='og:image')
+                twitter_image = soup.find('meta', attrs={'name': 'twitter:image'})
+                
+                scores['og_image_score'] = 1.0 if og_image or twitter_image else 0.0
+
+                # Check favicon
+                favicon = soup.find('link', rel='icon') or soup.find('link', rel='shortcut icon')
+                scores['favicon_score'] = 1.0 if favicon else 0.0
 
         except Exception as e:
             self.logger.error(f"Error analyzing social media: {e}")
 
         return scores
 
-    async def analyze_schema_markup(self, html: str) -> Dict[str, float]:
-        """Analyze schema.org and SEO markup."""
+    async def analyze_schema_markup(self, page: Union[PageContext, str]) -> Dict[str, float]:
+        """Analyze schema.org and SEO markup.
+        
+        Args:
+            page: The parsed page, or raw HTML to parse.
+        """
         scores = {
             'schema_score': 0.0,
             'json_ld_score': 0.0,
@@ -371,20 +942,22 @@ class LogoDetectionStrategies:
         }
 
         try:
-            soup = BeautifulSoup(html, 'html.parser')
+            soup = page.soup if isinstance(page, PageContext) else BeautifulSoup(page, HTML_PARSER)
 
             # Check JSON-LD
             json_ld = soup.find('script', type='application/ld+json')
-            if json_ld:
+            if json_ld and json_ld.string:
+                raw = json_ld.string
                 try:
-                    data = json.loads(json_ld.string)
+                    data = _json_loads(raw)
                     if isinstance(data, dict):
-                        scores['json_ld_score'] = 'logo' in str(data)
+                        # Search the source text rather than re-serializing the parsed object
+                        scores['json_ld_score'] = 'logo' in raw
                 except json.JSONDecodeError:
                     pass
 
             # Check schema.org markup
-            schema_elements = soup.find_all(attrs={'itemtype': re.compile(r'schema.org')})
+            schema_elements = soup.find_all(attrs={'itemtype': SCHEMA_ORG_PATTERN})
             for element in schema_elements:
                 if 'logo' in str(element):
                     scores['schema_score'] = 1.0
@@ -402,13 +975,28 @@ class LogoDetectionStrategies:
 
         return scores
 
-    def _get_element_path(self, element: Tag) -> str:
-        """Get a unique path for an element in the DOM."""
-        path = []
+    def _get_element_path(self, element: Tag, memo: Optional[Dict[int, str]] = None) -> str:
+        """Get a unique path for an element in the DOM, e.g. '[document][0] > html[0] > body[0] > div[2]'.
+        
+        Each step is an ancestor's name and its index among same-named siblings.
+        memo maps id(ancestor) -> path and lets a batch of lookups over the same,
+        still-alive tree stop at the first ancestor already resolved.
+        """
+        steps = []
+        prefix = ''
         for parent in element.parents:
-            siblings = parent.find_all(parent.name, recursive=False)
-            path.append(f"{parent.name}[{list(siblings).index(parent)}]")
-        return ' > '.join(reversed(path))
+            if memo is not None and id(parent) in memo:
+                prefix = memo[id(parent)]
+                break
+            index = sum(1 for sibling in parent.previous_siblings if sibling.name == parent.name)
+            steps.append((parent, f"{parent.name}[{index}]"))
+
+        path = prefix
+        for parent, step in reversed(steps):
+            path = f"{path} > {step}" if path else step
+            if memo is not None:
+                memo[id(parent)] = path
+        return path
 
     async def calculate_rank_score(self, logo_candidate: LogoCandidate) -> float:
         """Calculate a rank score for a logo candidate."""
@@ -416,12 +1004,12 @@ class LogoDetectionStrategies:
             # Extract domain name without TLD and clean it
             full_domain = extract_domain(logo_candidate.page_url)
             domain_name = full_domain.split('.')[0].lower()
-            domain_name = re.sub(r'[^a-z0-9\s]', '', domain_name).strip()
+            domain_name = NON_ALNUM_PATTERN.sub('', domain_name).strip()
             
             # Clean and check logo text
             logo_text = logo_candidate.text.lower() if hasattr(logo_candidate, 'text') and logo_candidate.text else ''
             # Clean OCR text by removing special characters and extra whitespace
-            logo_text = re.sub(r'[^a-z0-9\s]', '', logo_text).strip()
+            logo_text = NON_ALNUM_PATTERN.sub('', logo_text).strip()
             # Split into words and check each word
             logo_words = logo_text.split()
             
@@ -431,40 +1019,32 @@ class LogoDetectionStrategies:
             # Check if logo is in header/navigation
             is_header = logo_candidate.location.lower() == 'header/navigation'
             
-            # Debug logging
-            print(f"\nDEBUG: Calculating rank score for logo at {logo_candidate.image_url}")
-            print(f"DEBUG: Full domain: {full_domain}")
-            print(f"DEBUG: Domain name (without TLD): {domain_name}")
-            print(f"DEBUG: Logo text: {logo_text}")
-            print(f"DEBUG: Logo words: {logo_words}")
-            print(f"DEBUG: Is domain match: {is_domain_match}")
-            print(f"DEBUG: Is header: {is_header}")
+            self.logger.debug(
+                "Rank score for %s: domain=%s logo_text=%r domain_match=%s header=%s",
+                logo_candidate.image_url, domain_name, logo_text, is_domain_match, is_header,
+            )
             
             # Calculate rank score
             rank_score = 0.0
             
             # If it's a domain match in header, it's definitely the main logo
             if is_domain_match and is_header:
-                print(f"DEBUG: Found main logo! Domain match and header location.")
                 rank_score = 2.0  # Highest possible score
             elif is_header:
-                print(f"DEBUG: Header logo but no domain match.")
                 rank_score = 1.0  # Header logos get at least 1.0
             elif is_domain_match:
-                print(f"DEBUG: Domain match but not in header.")
                 rank_score = 0.9  # Domain match in main content
             else:
-                print(f"DEBUG: No domain match and not in header.")
                 rank_score = 0.5  # Default score for other logos
             
             # Add a small bonus to header logos to ensure they rank higher when scores are equal
             if is_header:
                 rank_score += 0.01
             
-            print(f"DEBUG: Final rank score: {rank_score}")
+            self.logger.debug("Final rank score: %s", rank_score)
             return rank_score
         except Exception as e:
-            print(f"Error calculating rank score: {e}")
+            self.logger.error(f"Error calculating rank score: {e}")
             return 0.0
 
     async def analyze_logo(self, logo_info: Dict[str, Any]) -> LogoCandidate:
@@ -473,52 +1053,55 @@ class LogoDetectionStrategies:
             # Create logo candidate with initial score
             logo_candidate = LogoCandidate(
                 url=logo_info.get("url", ""),
-                score=logo_info.get("score", 0.0)
+                score=logo_info.get("score", 0.0),
+                features={},
+                metadata={},
+                image_url=logo_info.get("url", ""),
+                page_url=logo_info.get("page_url", ""),
             )
             
             # Initialize visual characteristics
             logo_candidate.visual_characteristics = {}
             
-            # Analyze visual characteristics
-            await self.analyze_visual_characteristics(logo_info.get('image_data', b''), logo_candidate)
-            
-            # Analyze HTML context
-            await self.analyze_html_context(logo_info['element'], logo_info['page_url'])
-            
-            # Analyze structural position
-            await self.analyze_structural_position(logo_info['element'], logo_info.get('all_pages_elements', []))
-            
-            # Analyze URL semantics
-            await self.analyze_url_semantics(logo_info['url'])
-            
-            # Analyze image technical characteristics
-            await self.analyze_image_technical(logo_info['url'], logo_info.get('image_data', b''))
+            image_data = logo_info.get('image_data', b'')
+            page = logo_info.get('page')
             
-            # Analyze multi-page consistency
-            await self.analyze_multi_page_consistency(logo_info['url'], logo_info.get('all_pages_images', []))
+            # One content key per candidate for the analyzers' results cache
+            image_hash = logo_info.get('image_hash') or self._image_key(image_data)
             
-            # Analyze social media presence
-            await self.analyze_social_media(extract_domain(logo_info['page_url']))
+            # Decode up front so the visual and technical analyzers share one decode
+            if not is_svg(image_data):
+                try:
+                    await asyncio.to_thread(self._decode, image_data)
+                except Exception as e:
+                    # The analyzers report decoding errors themselves
+                    self.logger.debug("Could not pre-decode image %s: %s", logo_info.get('url', ''), e)
             
-            # Analyze schema markup
-            await self.analyze_schema_markup(logo_info['element'])
+            # The analyzers are independent: the image ones run in worker threads while
+            # the social media one waits on the network
+            results = await asyncio.gather(
+                self.analyze_visual_characteristics(image_data, logo_candidate, image_hash),
+                self.analyze_html_context(logo_info['element'], logo_info['page_url']),
+                self.analyze_structural_position(
+                    logo_info['element'],
+                    logo_info.get('all_pages_elements', []),
+                    logo_info.get('element_path_counts'),
+                ),
+                self.analyze_url_semantics(logo_info['url']),
+                self.analyze_image_technical(logo_info['url'], image_data, image_hash),
+                self.analyze_multi_page_consistency(
+                    logo_info['url'],
+                    logo_info.get('all_pages_images', []),
+                    logo_info.get('page_images_index'),
+                ),
+                self.analyze_social_media(extract_domain(logo_info['page_url']), page),
+                self.analyze_schema_markup(page or str(logo_info['element'])),
+            )
             
-            # Extract text from image using OCR
-            try:
-                # Try different PSM modes for better text extraction
-                psm_modes = [7, 6, 3]  # 7: single line, 6: uniform block, 3: fully automatic
-                extracted_text = ""
-                for psm in psm_modes:
-                    try:
-                        text = pytesseract.image_to_string(Image.open(io.BytesIO(logo_info.get('image_data', b'') if logo_info.get('image_data') else b'')), config=f'--psm {psm} --oem 3')
-                        if text:
-                            extracted_text = text
-                            break
-                    except Exception:
-                        continue
-                logo_candidate.text = extracted_text
-            except Exception as e:
-                print(f"Error extracting text from image: {str(e)}")
+            # Keep every analyzer's scores on the candidate; OCR text was already
+            # stored on it by analyze_visual_characteristics
+            for scores in results:
+                logo_candidate.features.update(scores)
             
             # Check if this is likely the main logo based on location and text
             if (logo_candidate.location.lower() == 'header/navigation' and 
@@ -536,12 +1119,12 @@ class LogoDetectionStrategies:
                     logo_candidate.classification = "unknown"
             
             # Calculate final rank score
-            logo_candidate.score = self.calculate_rank_score(logo_candidate)
+            logo_candidate.score = await self.calculate_rank_score(logo_candidate)
             
             return logo_candidate
             
         except Exception as e:
-            print(f"Error analyzing logo: {str(e)}")
+            self.logger.error(f"Error analyzing logo: {e}")
             return None 
 
 class LogoResult(BaseModel):
@@ -42,3 +42,353 @@ class TestBrowserHeaders:
         
         assert "User-Agent" in BROWSER_HEADERS
         assert "Chrome" in BROWSER_HEADERS["User-Agent"]
+
+
+class TestResponseParsing:
+    """Test parsing of gpt-4o-mini responses."""
+
+    def test_extract_confidence_score_line(self):
+        """A dedicated 'Confidence Score:' line should be parsed."""
+        from openlogo import LogoCrawler
+
+        crawler = LogoCrawler(api_key="test-key")
+        content = "Confidence Score: 0.92\nDescription: Blue wordmark"
+        assert crawler.extract_confidence_score(content) == 0.92
+
+    def test_extract_confidence_score_leading_number(self):
+        """A bare leading number should be used as the score."""
+        from openlogo import LogoCrawler
+
+        crawler = LogoCrawler(api_key="test-key")
+        assert crawler.extract_confidence_score("0.75 - The image shows a logo") == 0.75
+        assert crawler.extract_confidence_score("no score here") == 0.0
+
+    def test_extract_confidence_score_markdown(self):
+        """Markdown emphasis around the label should not hide the score."""
+        from openlogo import LogoCrawler
+
+        crawler = LogoCrawler(api_key="test-key")
+        assert crawler.extract_confidence_score("**Confidence Score:** 0.9\nDescription: x") == 0.9
+
+    def test_is_company_logo(self):
+        """Social media and UI-icon keywords in the description or URL rule out a company logo."""
+        from openlogo import LogoCrawler
+
+        crawler = LogoCrawler(api_key="test-key")
+        assert crawler.is_company_logo("Acme wordmark", "https://acme.com/logo.png")
+        assert not crawler.is_company_logo("Acme wordmark", "https://cdn.Facebook.com/acme.png")
+        assert not crawler.is_company_logo("Shopping CART", "https://acme.com/c.png")
+        crawler.non_company_logo_keywords.append("wordmark")
+        assert not crawler.is_company_logo("Acme wordmark", "https://acme.com/logo.png")
+
+    def test_parse_logo_analysis_json(self):
+        """JSON replies should be read directly; non-logos return None."""
+        from openlogo import LogoCrawler
+
+        crawler = LogoCrawler(api_key="test-key")
+        reply = '{"is_logo": true, "confidence": 0.91, "description": "Blue mark"}'
+        assert crawler.parse_logo_analysis(reply) == (0.91, "Blue mark")
+        assert crawler.parse_logo_analysis('{"is_logo": false}') is None
+        assert crawler.parse_logo_analysis("'null'") is None
+
+    def test_extract_description_case_insensitive(self):
+        """The description marker should match regardless of case."""
+        from openlogo import LogoCrawler
+
+        crawler = LogoCrawler(api_key="test-key")
+        assert crawler.extract_description("confidence: 0.9\ndescription: Red icon") == "Red icon"
+        assert crawler.extract_description("Confidence: 0.9\nA red icon") == "A red icon"
+
+    def test_retry_delay(self):
+        """Retry-After should win; otherwise back off exponentially."""
+        from openlogo import LogoCrawler
+
+        assert LogoCrawler._retry_delay(0, "3") == 3.0
+        assert LogoCrawler._retry_delay(0, "3600") == 30.0
+        assert 0.25 <= LogoCrawler._retry_delay(0) < 0.35
+        assert 2.0 <= LogoCrawler._retry_delay(3, "Wed, 21 Oct 2015 07:28:00 GMT") < 2.1
+
+    def test_rank_score_pattern(self):
+        """A logo without a score should not take the next logo's score."""
+        from openlogo.crawler import RANK_SCORE_PATTERN
+
+        reply = "Logo 1: wordmark. Score: 0.9\nLogo 2: icon only\nLogo 10 score: 0.2"
+        scores = {int(m.group(1)): float(m.group(2)) for m in RANK_SCORE_PATTERN.finditer(reply)}
+        assert scores == {1: 0.9, 10: 0.2}
+
+    def test_image_url_pattern(self):
+        """Image URLs are recognized with or without a query string."""
+        from openlogo.crawler import IMAGE_URL_PATTERN, SVG_URL_PATTERN
+
+        assert IMAGE_URL_PATTERN.search("https://acme.com/logo.PNG")
+        assert IMAGE_URL_PATTERN.search("https://acme.com/logo.png?v=2")
+        assert not IMAGE_URL_PATTERN.search("https://acme.com/logo.png.html")
+        assert not IMAGE_URL_PATTERN.search("https://acme.com/about")
+        assert SVG_URL_PATTERN.search("/static/logo.svg#mark")
+
+    def test_json_dumps_datetime(self):
+        """Datetimes serialize to ISO 8601 strings."""
+        from datetime import datetime
+        from openlogo.crawler import _json_dumps, _json_loads
+
+        timestamp = datetime(2024, 1, 2, 3, 4, 5, 678000)
+        assert _json_loads(_json_dumps({"timestamp": timestamp}, indent=True)) == {"timestamp": timestamp.isoformat()}
+
+    def test_looks_like_image(self):
+        """Mislabelled images are recognized from their leading bytes."""
+        from openlogo.crawler import _looks_like_image
+
+        assert _looks_like_image(b'\x89PNG\r\n\x1a\n' + b'\x00' * 16)
+        assert _looks_like_image(b'<?xml version="1.0"?><svg xmlns="http://www.w3.org/2000/svg"/>')
+        assert not _looks_like_image(b'<!DOCTYPE html><html></html>')
+
+    def test_probe_image_size(self):
+        """PNG, GIF and JPEG dimensions are read from the header bytes."""
+        import struct
+        from openlogo.crawler import _probe_image_size
+
+        png = b'\x89PNG\r\n\x1a\n' + b'\x00\x00\x00\x0d' + b'IHDR' + struct.pack('>II', 120, 40)
+        gif = b'GIF89a' + struct.pack('<HH', 16, 8)
+        app0 = b'\xff\xe0' + struct.pack('>H', 16) + b'JFIF\x00' + b'\x00' * 9
+        sof0 = b'\xff\xc0' + struct.pack('>HBHH', 17, 8, 300, 200)
+        jpeg = b'\xff\xd8' + app0 + sof0
+        assert _probe_image_size(png) == (120, 40)
+        assert _probe_image_size(gif) == (16, 8)
+        assert _probe_image_size(jpeg) == (200, 300)
+        assert _probe_image_size(b'RIFF\x00\x00\x00\x00WEBP') is None
+
+    def test_parse_rank_scores_json(self):
+        """JSON ranking replies should map logo indices to scores."""
+        from openlogo import LogoCrawler
+
+        crawler = LogoCrawler(api_key="test-key")
+        reply = '{"rankings": [{"index": 2, "score": 0.8}, {"index": 1, "score": 0.3}]}'
+        assert crawler.parse_rank_scores(reply) == {2: 0.8, 1: 0.3}
+        assert crawler.parse_rank_scores("Logo 1 score: 0.5") == {1: 0.5}
+
+    def test_iter_csv_urls(self, tmp_path):
+        """The URL column is detected from the header and rows are normalized."""
+        from openlogo import LogoCrawler
+
+        path = tmp_path / "sites.csv"
+        path.write_text("Name,Company Website\nA,example.com\nB,\nC,null\nD,http://example.org\n")
+        crawler = LogoCrawler(api_key="test-key")
+        column = crawler.detect_url_column_name(str(path))
+        assert column == "Company Website"
+        assert list(crawler.iter_csv_urls(str(path), column)) == ["https://example.com", "http://example.org"]
+
+
+class TestImageCache:
+    """Test the LRU image cache."""
+
+    def _result(self, url):
+        from datetime import datetime
+        from openlogo.crawler import LogoResult
+
+        return LogoResult(
+            url=url, confidence=0.9, description="logo", page_url="https://example.com",
+            image_hash=url, timestamp=datetime.now(),
+        )
+
+    def test_evicts_least_recently_used(self):
+        """Entries beyond max_entries should evict the least recently used."""
+        from openlogo.crawler import ImageCache
+
+        cache = ImageCache(max_entries=2)
+        cache.set("a", self._result("a"))
+        cache.set("b", self._result("b"))
+        assert cache.get("a") is not None  # "a" is now most recently used
+        cache.set("c", self._result("c"))
+
+        assert cache.get("b") is None
+        assert cache.get("a") is not None
+        assert cache.get("c") is not None
+
+    def test_expired_entries_are_dropped(self):
+        """Entries older than cache_duration should not be returned."""
+        from datetime import timedelta
+        from openlogo.crawler import ImageCache
+
+        cache = ImageCache(cache_duration=timedelta(0))
+        cache.set("a", self._result("a"))
+
+        assert cache.get("a") is None
+        assert "a" not in cache.cache
+
+    def test_expired_entries_are_purged_before_eviction(self):
+        """A full cache should drop expired entries anywhere, not just at the LRU end."""
+        from datetime import timedelta
+        from openlogo.crawler import ImageCache
+
+        cache = ImageCache(cache_duration=timedelta(seconds=10), max_entries=2)
+        with patch("openlogo.crawler.time.monotonic") as monotonic:
+            monotonic.return_value = 0.0
+            cache.set("a", self._result("a"))
+            monotonic.return_value = 5.0
+            cache.set("b", self._result("b"))
+            monotonic.return_value = 6.0
+            assert cache.get("a") is not None  # "a" is now most recently used
+            monotonic.return_value = 11.0  # "a" has expired, "b" hasn't
+            cache.set("c", self._result("c"))
+
+            assert "a" not in cache.cache
+            assert cache.get("b") is not None
+            assert cache.get("c") is not None
+
+    def test_results_are_copied(self):
+        """Page-specific fields set on a result shouldn't leak into later lookups."""
+        from openlogo.crawler import ImageCache
+
+        cache = ImageCache()
+        result = self._result("a")
+        cache.set("a", result)
+        result.is_header = True
+        hit = cache.get("a")
+        hit.rank_score = 2.0
+
+        again = cache.get("a")
+        assert not again.is_header
+        assert again.rank_score == 0.0
+
+    def test_save_and_load_round_trip(self, tmp_path):
+        """Saved entries should be served by a cache loaded from the same file."""
+        from openlogo.crawler import ImageCache
+
+        path = tmp_path / "cache.json"
+        cache = ImageCache()
+        cache.set("a", self._result("a"))
+        cache.save(str(path))
+
+        restored = ImageCache()
+        restored.load(str(path))
+        assert restored.get("a").url == "a"
+        assert restored.get("b") is None
+
+    def test_negative_entries(self, tmp_path):
+        """Images marked as non-logos are remembered and survive save/load."""
+        from openlogo.crawler import ImageCache
+
+        path = tmp_path / "cache.json"
+        cache = ImageCache()
+        cache.mark_negative("n")
+        assert cache.is_negative("n")
+        assert not cache.is_negative("a")
+        cache.save(str(path))
+
+        restored = ImageCache()
+        restored.load(str(path))
+        assert restored.is_negative("n")
+        assert restored.get("n") is None
+
+    def test_negative_duration(self):
+        """Negatives can expire sooner than analysis results."""
+        from datetime import timedelta
+        from openlogo.crawler import ImageCache
+
+        cache = ImageCache(negative_duration=timedelta(0))
+        cache.mark_negative("n")
+        assert not cache.is_negative("n")
+
+
+class TestVisualCharacteristics:
+    """Tests for the image helpers in the detection module."""
+
+    def test_count_dominant_colors(self):
+        """Small color differences share a bucket and rare colors are ignored."""
+        import numpy as np
+        from openlogo.detection import count_dominant_colors
+
+        img = np.zeros((100, 100, 3), dtype=np.uint8)
+        img[:50] = (250, 250, 250)
+        img[50:] = (20, 40, 200)
+        img[50:, :10] = (22, 41, 203)
+        img[0, 0] = (0, 255, 0)
+        assert count_dominant_colors(img) == 2
+
+    def test_terms_pattern(self):
+        """One compiled alternation matches any of the terms as a substring."""
+        from openlogo.detection import terms_pattern
+
+        pattern = terms_pattern({'logo', 'site-logo', 'cdn'})
+        assert pattern.search('/static/site-logo.png')
+        assert pattern.search('img.cdn.example.com')
+        assert not pattern.search('/images/hero.jpg')
+
+    def test_summarize_svg(self):
+        """SVG logos are summarized from their markup."""
+        from openlogo.detection import is_svg, summarize_svg
+
+        svg = (
+            b'<?xml version="1.0"?>\n'
+            b'<svg xmlns="http://www.w3.org/2000/svg" viewBox="0 0 200 100">'
+            b'<g fill="#112233"><path d="M0 0h10v10z"/><circle r="5" fill="none"/></g>'
+            b'<text fill="#FFFFFF">Acme!</text></svg>'
+        )
+        assert is_svg(svg)
+        assert not is_svg(b'\x89PNG\r\n\x1a\n')
+        summary = summarize_svg(svg)
+        assert (summary['width'], summary['height']) == (200.0, 100.0)
+        assert summary['shapes'] == 2
+        assert summary['colors'] == {'#112233', '#ffffff'}
+        assert summary['text'] == 'Acme'
+
+
+class TestDetectionStrategies:
+    """Tests for the page-level scoring in LogoDetectionStrategies."""
+
+    def test_json_ld_with_orjson(self):
+        """JSON-LD from a parsed <script> is scored when orjson does the parsing."""
+        import asyncio
+        pytest.importorskip("orjson")
+        from openlogo.detection import LogoDetectionStrategies, ORJSON_AVAILABLE
+
+        assert ORJSON_AVAILABLE
+        strategies = LogoDetectionStrategies()
+        html = '<script type="application/ld+json">{"logo": "https://example.com/logo.png"}</script>'
+        scores = asyncio.run(strategies.analyze_schema_markup(html))
+        assert scores['json_ld_score']
+
+    def test_analyze_logo(self):
+        """A candidate is scored by every analyzer and ranked."""
+        import asyncio
+        import io
+        from PIL import Image
+        from openlogo.detection import LogoCandidate, LogoDetectionStrategies, PageContext
+
+        buffer = io.BytesIO()
+        Image.new('RGBA', (120, 40), (20, 40, 200, 255)).save(buffer, format='PNG')
+        page = PageContext.parse(
+            'https://acme.com/',
+            '<header><a href="/"><img class="site-logo" src="/static/logo.png" alt="Acme logo"></a></header>',
+        )
+        strategies = LogoDetectionStrategies()
+        candidate = asyncio.run(strategies.analyze_logo({
+            'url': 'https://acme.com/static/logo.png',
+            'page_url': 'https://acme.com/',
+            'element': page.soup.find('img'),
+            'image_data': buffer.getvalue(),
+            'page': page,
+        }))
+
+        assert isinstance(candidate, LogoCandidate)
+        assert candidate.features['class_score']
+        assert candidate.features['homepage_link_score']
+        assert candidate.features['filename_score']
+        assert candidate.score > 0
+
+    def test_multi_page_consistency_from_index(self):
+        """Appearance is scored from a prebuilt index even without the image list."""
+        import asyncio
+        from openlogo.detection import LogoDetectionStrategies
+
+        strategies = LogoDetectionStrategies()
+        images = [
+            {'url': 'logo.png', 'position': 'header', 'size': (120, 40), 'in_template': True},
+            {'url': 'logo.png', 'position': 'header', 'size': (120, 40), 'in_template': True},
+            {'url': 'hero.jpg', 'position': 'main', 'size': (800, 400), 'in_template': False},
+            {'url': 'team.jpg', 'position': 'main', 'size': (400, 400), 'in_template': False},
+        ]
+        index = strategies.index_page_images(images)
+        scores = asyncio.run(strategies.analyze_multi_page_consistency('logo.png', [], index))
+        assert scores['appearance_score'] == 0.5
+        assert scores['template_score']